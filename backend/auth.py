@@ -1,3 +1,6 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
@@ -5,19 +8,97 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
 
+from lru import LRUCache
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 SECRET_KEY = os.environ.get("JWT_SECRET", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# bcrypt is CPU-bound; run it off the event loop in a small dedicated pool
+PASSWORD_POOL_SIZE = int(os.environ.get("PASSWORD_POOL_SIZE", 4))
+PASSWORD_MAX_QUEUE = int(os.environ.get("PASSWORD_MAX_QUEUE", 64))
+PASSWORD_QUEUE_TIMEOUT = float(os.environ.get("PASSWORD_QUEUE_TIMEOUT", 5))
+
+password_pool = ThreadPoolExecutor(max_workers=PASSWORD_POOL_SIZE, thread_name_prefix="bcrypt")
+password_pool_stats = {"active": 0, "queued": 0, "maxQueued": 0, "completed": 0, "rejected": 0}
+_password_slots = None
+
+# Verified token -> payload, so repeat requests skip signature verification
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", 1024))
+TOKEN_CACHE_TTL = float(os.environ.get("TOKEN_CACHE_TTL", 300))
+
+class TokenCache:
+    def __init__(self, max_size=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL):
+        self.ttl = ttl
+        self._entries = LRUCache(max_size)
+
+    def get(self, token):
+        return self._entries.get(token)
+
+    def set(self, token, payload):
+        # Never keep an entry past the token's own exp claim
+        ttl = min(payload.get("exp", 0) - time.time(), self.ttl)
+        self._entries.set(token, payload, ttl)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return self._entries.stats()
+
+token_cache = TokenCache()
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def _password_pool_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please try again",
+        headers={"Retry-After": "1"},
+    )
+
+async def _run_in_password_pool(func, *args):
+    global _password_slots
+    if _password_slots is None:
+        _password_slots = asyncio.Semaphore(PASSWORD_POOL_SIZE)
+    stats = password_pool_stats
+    if stats["queued"] >= PASSWORD_MAX_QUEUE:
+        stats["rejected"] += 1
+        raise _password_pool_busy()
+    stats["queued"] += 1
+    stats["maxQueued"] = max(stats["maxQueued"], stats["queued"])
+    try:
+        await asyncio.wait_for(_password_slots.acquire(), PASSWORD_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        stats["rejected"] += 1
+        raise _password_pool_busy()
+    finally:
+        stats["queued"] -= 1
+    stats["active"] += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(password_pool, func, *args)
+    finally:
+        stats["active"] -= 1
+        stats["completed"] += 1
+        _password_slots.release()
+
+async def verify_password_async(plain_password, hashed_password):
+    return await _run_in_password_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await _run_in_password_pool(get_password_hash, password)
+
+def get_password_pool_stats():
+    return {"workers": PASSWORD_POOL_SIZE, "maxQueue": PASSWORD_MAX_QUEUE, **password_pool_stats}
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     if expires_delta:
@@ -29,11 +110,15 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 def decode_token(token: str):
+    payload = token_cache.get(token)
+    if payload is not None:
+        return dict(payload)
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    token_cache.set(token, payload)
+    return dict(payload)
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
@@ -46,6 +131,12 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         )
     return payload
 
+async def get_optional_user(credentials: HTTPAuthorizationCredentials = Depends(optional_security)):
+    # Public routes personalise for a valid token and treat anything else as anonymous
+    if credentials is None:
+        return None
+    return decode_token(credentials.credentials)
+
 async def get_current_admin_user(current_user: dict = Depends(get_current_user)):
     if not current_user.get("isAdmin", False):
         raise HTTPException(
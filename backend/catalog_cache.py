@@ -0,0 +1,58 @@
+import os
+from threading import Lock
+
+from lru import LRUCache
+
+
+CATALOG_CACHE_SIZE = int(os.environ.get("CATALOG_CACHE_SIZE", 256))
+# Upper bound on staleness for writes that bypass the API (scripts, other workers)
+CATALOG_CACHE_TTL = float(os.environ.get("CATALOG_CACHE_TTL", 300))
+
+
+def normalize_filter(value):
+    if value is None:
+        return None
+    value = value.strip()
+    if not value or value == "All":
+        return None
+    return value
+
+
+class CatalogCache:
+    """Versioned LRU cache for tool listings.
+
+    Entries are tagged with the catalog version they were computed at; any
+    write to the catalog bumps the version, so stale entries are never served.
+    """
+
+    def __init__(self, max_size=CATALOG_CACHE_SIZE, ttl=CATALOG_CACHE_TTL):
+        self.version = 0
+        self._entries = LRUCache(max_size, ttl)
+        self._lock = Lock()
+
+    @staticmethod
+    def make_key(search=None, category=None, pricing=None, *extra):
+        search = normalize_filter(search)
+        if search is not None:
+            search = " ".join(search.lower().split())
+        return (search, normalize_filter(category), normalize_filter(pricing)) + extra
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key, value, version=None):
+        with self._lock:
+            # A write may have landed while the caller was querying Mongo
+            if version is not None and version != self.version:
+                return
+            self._entries.set(key, value)
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"version": self.version, **self._entries.stats()}
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import os
+from collections import Counter
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+# Seconds between flushes; a crash loses at most this much counting
+COUNTER_FLUSH_INTERVAL = float(os.environ.get("COUNTER_FLUSH_INTERVAL", 10))
+# An outbound click says more about a tool than a detail-page view
+CLICK_WEIGHT = 5
+
+
+def popularity(counts):
+    return counts.get("views", 0) + CLICK_WEIGHT * counts.get("clicks", 0)
+
+
+class CounterAccumulator:
+    """Write-behind per-tool counters.
+
+    Hits are summed in memory and written as one unordered bulk_write of
+    `$inc` upserts per flush, instead of one update per request. Deltas from
+    a failed flush are kept for the next one, so a flush that failed after
+    reaching the server may be counted twice.
+    """
+
+    def __init__(self, collection, key="toolId"):
+        self.collection = collection
+        self.key = key
+        self._pending = {}
+        self.flushes = 0
+        self.failures = 0
+        self.written = 0
+
+    def incr(self, tool_id, field, amount=1):
+        counts = self._pending.get(tool_id)
+        if counts is None:
+            self._pending[tool_id] = counts = Counter()
+        counts[field] += amount
+
+    def _requeue(self, pending):
+        for tool_id, counts in pending.items():
+            for field, amount in counts.items():
+                self.incr(tool_id, field, amount)
+
+    async def flush(self):
+        """Write pending deltas; returns the ones that were written."""
+        if not self._pending:
+            return {}
+        pending, self._pending = self._pending, {}
+        tool_ids = list(pending)
+        ops = [UpdateOne({self.key: tool_id}, {"$inc": dict(pending[tool_id])}, upsert=True) for tool_id in tool_ids]
+        try:
+            await self.collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            # Unordered: only the reported ops failed, e.g. two workers racing
+            # to upsert the same new tool
+            failed = {tool_ids[error["index"]] for error in e.details.get("writeErrors", [])}
+            self._requeue({tool_id: pending.pop(tool_id) for tool_id in failed})
+            self.failures += 1
+        except BaseException:
+            # Including cancellation at shutdown, which flushes once more
+            self._requeue(pending)
+            self.failures += 1
+            raise
+        self.flushes += 1
+        self.written += len(pending)
+        return pending
+
+    async def run(self, interval=COUNTER_FLUSH_INTERVAL, on_flush=None):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                flushed = await self.flush()
+            except Exception:
+                logger.exception("Counter flush failed, retrying next interval")
+                continue
+            if flushed and on_flush is not None:
+                on_flush(flushed)
+
+    def stats(self):
+        return {
+            "pendingTools": len(self._pending),
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "written": self.written,
+        }
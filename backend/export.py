@@ -0,0 +1,38 @@
+import zlib
+
+from models import TOOL_PUBLIC_PROJECTION
+from serialization import dumps
+
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_SORT = [("name", 1), ("id", 1)]
+
+
+def to_ndjson_line(doc):
+    return dumps(doc) + b"\n"
+
+
+async def iter_ndjson(collection, query=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield the collection as NDJSON, one encoded chunk per cursor batch.
+
+    Only one batch is held in memory at a time, however large the catalog is.
+    """
+    cursor = collection.find(query or {}, TOOL_PUBLIC_PROJECTION).sort(EXPORT_SORT).batch_size(batch_size)
+    lines = []
+    async for doc in cursor:
+        lines.append(to_ndjson_line(doc))
+        if len(lines) >= batch_size:
+            yield b"".join(lines)
+            lines = []
+    if lines:
+        yield b"".join(lines)
+
+
+async def gzip_chunks(chunks):
+    # wbits=31 selects the gzip container rather than raw zlib
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
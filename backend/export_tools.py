@@ -0,0 +1,39 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from dotenv import load_dotenv
+from pathlib import Path
+from motor.motor_asyncio import AsyncIOMotorClient
+from export import iter_ndjson, gzip_chunks, EXPORT_BATCH_SIZE
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+async def export_tools(output, batch_size, compress):
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    started = time.perf_counter()
+    written = 0
+    chunks = iter_ndjson(db.tools, batch_size=batch_size)
+    if compress:
+        chunks = gzip_chunks(chunks)
+    out = sys.stdout.buffer if output == "-" else open(output, "wb")
+    try:
+        async for chunk in chunks:
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        client.close()
+    print(f"Exported {written} bytes in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the tool catalog as NDJSON")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    parser.add_argument("--gzip", action="store_true", help="gzip the output")
+    args = parser.parse_args()
+    asyncio.run(export_tools(args.output, args.batch_size, args.gzip))
@@ -0,0 +1,69 @@
+from collections import Counter
+
+
+FACET_PIPELINE = [
+    {"$facet": {
+        "total": [{"$count": "count"}],
+        "category": [{"$group": {"_id": "$category", "count": {"$sum": 1}}}],
+        "pricing": [{"$group": {"_id": "$pricing", "count": {"$sum": 1}}}],
+        "categoryPricing": [
+            {"$group": {"_id": {"category": "$category", "pricing": "$pricing"}, "count": {"$sum": 1}}}
+        ],
+    }}
+]
+
+
+class FacetCounts:
+    """Per-category, per-pricing and category x pricing tool counts.
+
+    Loaded once from a single $facet aggregation, then adjusted in place by
+    the tool write routes instead of being recomputed per request.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.total = 0
+        self.category = Counter()
+        self.pricing = Counter()
+        self.category_pricing = Counter()
+
+    def load(self, result):
+        self.total = result["total"][0]["count"] if result["total"] else 0
+        self.category = Counter({row["_id"]: row["count"] for row in result["category"]})
+        self.pricing = Counter({row["_id"]: row["count"] for row in result["pricing"]})
+        self.category_pricing = Counter({
+            (row["_id"].get("category"), row["_id"].get("pricing")): row["count"]
+            for row in result["categoryPricing"]
+        })
+        self.ready = True
+
+    def _adjust(self, tool, delta):
+        category, pricing = tool.get("category"), tool.get("pricing")
+        self.total += delta
+        self.category[category] += delta
+        self.pricing[pricing] += delta
+        self.category_pricing[(category, pricing)] += delta
+        # Drop zeroed buckets so empty facets disappear from the response
+        for counter, key in ((self.category, category), (self.pricing, pricing),
+                             (self.category_pricing, (category, pricing))):
+            if counter[key] <= 0:
+                del counter[key]
+
+    def add(self, tool, previous=None):
+        if previous is not None:
+            self._adjust(previous, -1)
+        self._adjust(tool, 1)
+
+    def remove(self, tool):
+        self._adjust(tool, -1)
+
+    def as_dict(self):
+        return {
+            "total": self.total,
+            "categories": dict(sorted(self.category.items(), key=lambda item: str(item[0]))),
+            "pricing": dict(sorted(self.pricing.items(), key=lambda item: str(item[0]))),
+            "categoryPricing": [
+                {"category": category, "pricing": pricing, "count": count}
+                for (category, pricing), count in sorted(self.category_pricing.items(), key=str)
+            ],
+        }
@@ -0,0 +1,45 @@
+import os
+
+from lru import LRUCache
+
+
+FAVORITES_CACHE_SIZE = int(os.environ.get("FAVORITES_CACHE_SIZE", 4096))
+# Bounds staleness from writes handled by other workers
+FAVORITES_CACHE_TTL = float(os.environ.get("FAVORITES_CACHE_TTL", 60))
+
+
+class FavoriteIdCache:
+    """Bounded LRU of user id -> set of favorited tool ids.
+
+    add/discard only touch users already cached. `set` is given the write
+    counter observed before the Mongo read and refuses to store a set that a
+    concurrent add or remove may have made stale. Entries expire after `ttl`
+    seconds so changes made through other workers show up.
+    """
+
+    def __init__(self, max_size=FAVORITES_CACHE_SIZE, ttl=FAVORITES_CACHE_TTL):
+        self.writes = 0
+        self._entries = LRUCache(max_size, ttl)
+
+    def get(self, user_id):
+        return self._entries.get(user_id)
+
+    def set(self, user_id, ids, writes_seen):
+        if writes_seen != self.writes:
+            return
+        self._entries.set(user_id, ids)
+
+    def add(self, user_id, tool_id):
+        self.writes += 1
+        ids = self._entries.peek(user_id)
+        if ids is not None:
+            ids.add(tool_id)
+
+    def discard(self, user_id, tool_id):
+        self.writes += 1
+        ids = self._entries.peek(user_id)
+        if ids is not None:
+            ids.discard(tool_id)
+
+    def stats(self):
+        return self._entries.stats()
@@ -0,0 +1,114 @@
+import re
+from collections import Counter
+
+
+WORD_RE = re.compile(r"[A-Za-z0-9]+")
+# Queries shorter than this are too ambiguous to correct
+MIN_FUZZY_LENGTH = 3
+
+
+def max_edits(length):
+    # Same steps as Elasticsearch's AUTO fuzziness; more edits than this lets
+    # the trigram filter through most of the vocabulary
+    if length < MIN_FUZZY_LENGTH:
+        return 0
+    return 1 if length <= 5 else 2
+
+
+def normalize(text):
+    return " ".join(word.lower() for word in WORD_RE.findall(text or ""))
+
+
+def trigrams(term):
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def fuzzy_terms(tool):
+    """Each word of the name and each tag without its '#'."""
+    terms = set(normalize(tool.get("name")).split(" "))
+    terms.update(normalize(tag).replace(" ", "") for tag in tool.get("tags") or [])
+    return {term for term in terms if term}
+
+
+def bounded_edit_distance(a, b, limit):
+    """Levenshtein distance between a and b, or None if it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        # Every later row is at least this row's minimum
+        if min(current) > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class TrigramIndex:
+    """Trigram postings over tool terms, for typo-tolerant lookups.
+
+    A term within k edits of the query shares at least
+    len(trigrams(query)) - 3k trigrams with it, since one edit touches at
+    most three of them. Terms below that count are never verified; the rest
+    are checked with a bounded edit distance.
+    """
+
+    def __init__(self):
+        self._grams = {}
+        self._term_tools = {}
+        self._tool_terms = {}
+
+    def add(self, tool_id, terms):
+        self.remove(tool_id)
+        self._tool_terms[tool_id] = terms
+        for term in terms:
+            tools = self._term_tools.get(term)
+            if tools is None:
+                self._term_tools[term] = tools = set()
+                for gram in trigrams(term):
+                    self._grams.setdefault(gram, set()).add(term)
+            tools.add(tool_id)
+
+    def remove(self, tool_id):
+        for term in self._tool_terms.pop(tool_id, ()):
+            tools = self._term_tools[term]
+            tools.discard(tool_id)
+            if tools:
+                continue
+            del self._term_tools[term]
+            for gram in trigrams(term):
+                terms = self._grams[gram]
+                terms.discard(term)
+                if not terms:
+                    del self._grams[gram]
+
+    def search(self, text):
+        """Similarity (1 - edits / length) of every tool with a close term."""
+        query = normalize(text)
+        limit = max_edits(len(query))
+        if not limit:
+            return {}
+        grams = trigrams(query)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+        needed = len(grams) - 3 * limit
+        scores = {}
+        for term, count in shared.items():
+            if count < needed:
+                continue
+            distance = bounded_edit_distance(query, term, limit)
+            if distance is None:
+                continue
+            similarity = 1 - distance / max(len(query), len(term))
+            for tool_id in self._term_tools[term]:
+                if similarity > scores.get(tool_id, 0.0):
+                    scores[tool_id] = similarity
+        return scores
@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from fastapi import Response
+
+
+# Browsers revalidate quickly; a CDN in front may hold responses a bit longer
+CATALOG_CACHE_CONTROL = os.environ.get(
+    "CATALOG_CACHE_CONTROL", "public, max-age=30, s-maxage=60, stale-while-revalidate=120"
+)
+STATIC_CACHE_CONTROL = os.environ.get("STATIC_CACHE_CONTROL", "public, max-age=3600, s-maxage=86400")
+# Responses personalised for a signed-in user must never be stored by a CDN
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, datetime):
+            part = part.isoformat()
+        digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def content_etag(value):
+    # Derived from what is served, so workers agree and a refreshed cache
+    # entry with new data never matches an old tag
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return f'"{hashlib.sha1(raw.encode()).hexdigest()[:32]}"'
+
+
+def page_etag(*parts, tools):
+    """ETag for a list of tools: each tool's (id, updatedAt) plus any
+    request parts that shape the body, such as the next cursor."""
+    return make_etag(*parts, [(tool["id"], tool.get("updatedAt")) for tool in tools])
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+
+def cache_headers(etag, cache_control=CATALOG_CACHE_CONTROL, vary=None):
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if vary:
+        headers["Vary"] = vary
+    return headers
+
+
+def not_modified(etag, cache_control=CATALOG_CACHE_CONTROL, vary=None):
+    return Response(status_code=304, headers=cache_headers(etag, cache_control, vary))
@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import logging
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Declared index set per collection. `ensure_indexes` creates anything missing
+# and logs drift; it never drops indexes on its own.
+INDEXES = {
+    "tools": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("category", ASCENDING), ("pricing", ASCENDING), ("name", ASCENDING), ("id", ASCENDING)],
+                   name="category_pricing_name_id"),
+        IndexModel([("name", ASCENDING), ("id", ASCENDING)], name="name_id"),
+        # Loader upsert key; sparse because API-created tools get theirs on the next load
+        IndexModel([("naturalKey", ASCENDING)], name="naturalKey_unique", unique=True, sparse=True),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "favorites": [
+        IndexModel([("userId", ASCENDING), ("toolId", ASCENDING)], name="userId_toolId_unique", unique=True),
+        IndexModel([("userId", ASCENDING), ("createdAt", ASCENDING), ("id", ASCENDING)],
+                   name="userId_createdAt_id"),
+    ],
+    "submissions": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("createdAt", DESCENDING)], name="status_createdAt"),
+        IndexModel([("createdAt", DESCENDING), ("id", DESCENDING)], name="createdAt_id"),
+    ],
+    # Write-behind view/click counters, upserted by toolId
+    "tool_stats": [
+        IndexModel([("toolId", ASCENDING)], name="toolId_unique", unique=True),
+    ],
+    # Used by RATE_LIMIT_BACKEND=mongo; documents expire once their window has passed
+    "rate_limits": [
+        IndexModel([("expiresAt", ASCENDING)], name="expiresAt_ttl", expireAfterSeconds=0),
+    ],
+}
+
+
+def _key(spec):
+    return tuple((field, int(direction)) for field, direction in spec)
+
+
+def _describe(collection, name, info):
+    keys = ", ".join(f"{field}:{direction}" for field, direction in info["key"])
+    return f"{collection}.{name} ({keys}{', unique' if info.get('unique') else ''})"
+
+
+async def index_drift(db):
+    """Return (missing, mismatched, extra) index descriptions per the declared set."""
+    missing, mismatched, extra = {}, [], []
+    for collection, models in INDEXES.items():
+        existing = await db[collection].index_information()
+        by_key = {_key(info["key"]): (name, info) for name, info in existing.items()}
+        declared_keys = set()
+        for model in models:
+            doc = model.document
+            key = _key(doc["key"].items())
+            declared_keys.add(key)
+            found = by_key.get(key)
+            if found is None:
+                missing.setdefault(collection, []).append(model)
+            elif bool(found[1].get("unique")) != bool(doc.get("unique")):
+                mismatched.append(
+                    f"{_describe(collection, found[0], found[1])} expected unique={bool(doc.get('unique'))}"
+                )
+        for key, (name, info) in by_key.items():
+            if name != "_id_" and key not in declared_keys:
+                extra.append(_describe(collection, name, info))
+    return missing, mismatched, extra
+
+
+async def ensure_indexes(db):
+    missing, mismatched, extra = await index_drift(db)
+    for collection, models in missing.items():
+        try:
+            created = await db[collection].create_indexes(models)
+            logger.info("Created indexes on %s: %s", collection, ", ".join(created))
+        except OperationFailure as e:
+            # Typically duplicate data blocking a unique index; serve anyway
+            logger.error("Could not create indexes on %s: %s", collection, e)
+    for description in mismatched:
+        logger.warning("Index drift: %s", description)
+    for description in extra:
+        logger.warning("Index drift: undeclared index %s", description)
+
+
+async def index_stats(db):
+    stats = []
+    for collection in INDEXES:
+        async for entry in db[collection].aggregate([{"$indexStats": {}}]):
+            stats.append({
+                "collection": collection,
+                "name": entry["name"],
+                "ops": entry["accesses"]["ops"],
+                "since": entry["accesses"]["since"],
+            })
+    return stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Reconcile and inspect MongoDB indexes")
+    parser.add_argument("--check", action="store_true", help="report drift without creating indexes")
+    parser.add_argument("--stats", action="store_true", help="print per-index usage counters")
+    args = parser.parse_args()
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    try:
+        if args.stats:
+            for entry in await index_stats(db):
+                print(f"{entry['collection']:<12} {entry['name']:<28} {entry['ops']:>10} ops since {entry['since']:%Y-%m-%d %H:%M}")
+        elif args.check:
+            missing, mismatched, extra = await index_drift(db)
+            for collection, models in missing.items():
+                for model in models:
+                    print(f"missing: {collection}.{model.document['name']}")
+            for description in mismatched:
+                print(f"mismatched: {description}")
+            for description in extra:
+                print(f"undeclared: {description}")
+        else:
+            await ensure_indexes(db)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    asyncio.run(main())
@@ -0,0 +1,235 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from models import ToolCreate
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+LOAD_BATCH_SIZE = 1000
+TOOL_FIELDS = tuple(ToolCreate.model_fields)
+
+
+def natural_key(name):
+    # Tools are identified by name, as in update_featured_only.py; URLs are not
+    # unique here (affiliate links are shared between tools)
+    return " ".join((name or "").lower().split())
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, e
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        # Line 1 is the header
+        for line_no, row in enumerate(csv.DictReader(f), 2):
+            tags = (row.get("tags") or "").strip()
+            if tags.startswith("["):
+                try:
+                    row["tags"] = json.loads(tags)
+                except json.JSONDecodeError as e:
+                    yield line_no, e
+                    continue
+            else:
+                row["tags"] = [tag.strip() for tag in tags.replace("|", ",").split(",") if tag.strip()]
+            if "featured" in row:
+                row["featured"] = (row["featured"] or "").strip().lower() in ("1", "true", "yes")
+            yield line_no, row
+
+
+def read_records(path, fmt=None):
+    fmt = fmt or ("csv" if str(path).lower().endswith(".csv") else "jsonl")
+    return read_csv(path) if fmt == "csv" else read_jsonl(path)
+
+
+def batched(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def unkeyed_tools(db, projection=None):
+    """Tools without naturalKey (created through the API or older seeds),
+    split into those that can take their key and colliding names.
+
+    A name collides when several unkeyed tools normalize to it, or a keyed
+    tool already holds it; guessing which tool a record means would update
+    an arbitrary one, so collisions are reported and left alone.
+    """
+    groups = {}
+    async for tool in db.tools.find({"naturalKey": {"$exists": False}}, projection or {"_id": 0}):
+        groups.setdefault(natural_key(tool.get("name")), []).append(tool)
+    taken = set()
+    if groups:
+        async for tool in db.tools.find({"naturalKey": {"$in": list(groups)}}, {"_id": 0, "naturalKey": 1}):
+            taken.add(tool["naturalKey"])
+    keyable, collisions = {}, {}
+    for key, tools in groups.items():
+        if len(tools) == 1 and key not in taken:
+            keyable[key] = tools[0]
+        else:
+            collisions[key] = [tool["id"] for tool in tools]
+    return keyable, collisions
+
+
+async def legacy_tools_by_key(db):
+    # Dry runs must not write, so resolve tools without naturalKey in memory
+    return await unkeyed_tools(db)
+
+
+async def backfill_natural_keys(db):
+    keyable, collisions = await unkeyed_tools(db, {"_id": 0, "id": 1, "name": 1})
+    keys = list(keyable)
+    if keys:
+        try:
+            await db.tools.bulk_write(
+                [UpdateOne({"id": keyable[key]["id"]}, {"$set": {"naturalKey": key}}) for key in keys],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            # The unique index caught a key taken meanwhile, e.g. by a concurrent load
+            for error in e.details.get("writeErrors", []):
+                key = keys[error["index"]]
+                collisions[key] = [keyable.pop(key)["id"]]
+    return keyable, collisions
+
+
+async def load_batch(db, batch, stats, dry_run=False, legacy=None, collisions=None):
+    valid = {}
+    for line_no, record in batch:
+        if isinstance(record, Exception):
+            stats["errors"].append((line_no, str(record)))
+            continue
+        try:
+            tool = ToolCreate(**record).dict()
+        except ValidationError as e:
+            stats["errors"].append((line_no, "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+            )))
+            continue
+        key = natural_key(tool["name"])
+        if collisions and key in collisions:
+            stats["errors"].append((line_no, f"name matches several existing tools: {', '.join(collisions[key])}"))
+            continue
+        # A later record with the same key wins, as it would with sequential upserts
+        valid[key] = (line_no, tool)
+    if not valid:
+        return
+    existing = {}
+    async for doc in db.tools.find({"naturalKey": {"$in": list(valid)}}, {"_id": 0}):
+        existing[doc["naturalKey"]] = doc
+    for key, doc in (legacy or {}).items():
+        if key in valid:
+            existing.setdefault(key, doc)
+    now = datetime.utcnow()
+    ops, op_lines = [], []
+    for key, (line_no, tool) in valid.items():
+        current = existing.get(key)
+        if current is None:
+            stats["created"] += 1
+            if dry_run:
+                print(f"+ {tool['name']} ({key})")
+        else:
+            changed = [field for field in TOOL_FIELDS if current.get(field) != tool[field]]
+            if not changed:
+                stats["unchanged"] += 1
+                continue
+            stats["updated"] += 1
+            if dry_run:
+                print(f"~ {tool['name']} ({key}): {', '.join(changed)}")
+        ops.append(UpdateOne(
+            {"naturalKey": key},
+            {
+                "$set": {**tool, "naturalKey": key, "updatedAt": now},
+                "$setOnInsert": {"id": str(uuid.uuid4()), "createdAt": now},
+            },
+            upsert=True
+        ))
+        op_lines.append(line_no)
+    if ops and not dry_run:
+        try:
+            await db.tools.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            # e.g. a concurrent load inserted the same key between our read and upsert
+            for error in e.details.get("writeErrors", []):
+                stats["errors"].append((op_lines[error["index"]], error["errmsg"]))
+
+
+async def load_records(db, records, batch_size=LOAD_BATCH_SIZE, dry_run=False, progress=True):
+    stats = {"read": 0, "created": 0, "updated": 0, "unchanged": 0, "errors": []}
+    legacy = None
+    if dry_run:
+        legacy, collisions = await legacy_tools_by_key(db)
+    else:
+        _, collisions = await backfill_natural_keys(db)
+    stats["collisions"] = collisions
+    started = time.perf_counter()
+    for batch in batched(records, batch_size):
+        stats["read"] += len(batch)
+        await load_batch(db, batch, stats, dry_run, legacy, collisions)
+        if progress:
+            elapsed = time.perf_counter() - started
+            print(f"{stats['read']} records, {stats['read'] / elapsed:.0f} records/s", file=sys.stderr)
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Stream tools from JSONL/CSV into MongoDB with idempotent upserts")
+    parser.add_argument("path", help="JSONL or CSV file")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=LOAD_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="print the diff without writing")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    try:
+        stats = await load_records(db, read_records(args.path, args.format), args.batch_size, args.dry_run)
+    finally:
+        client.close()
+    for key, tool_ids in stats["collisions"].items():
+        print(f"name collision, naturalKey not assigned: '{key}' ({', '.join(tool_ids)})", file=sys.stderr)
+    for line_no, error in stats["errors"]:
+        print(f"line {line_no}: {error}", file=sys.stderr)
+    verb = "Would create" if args.dry_run else "Created"
+    print(
+        f"{verb} {stats['created']}, updated {stats['updated']}, unchanged {stats['unchanged']}, "
+        f"errors {len(stats['errors'])} in {stats['seconds']:.2f}s"
+    )
+    if not args.dry_run and (stats["created"] or stats["updated"]):
+        print(
+            "Running API workers serve new listings within CATALOG_CACHE_TTL; "
+            "search, suggestions and facets refresh after POST /api/admin/reload"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Bounded LRU mapping with optional per-entry expiry and hit counters.
+
+    `ttl` is the default lifetime in seconds (None keeps entries until they
+    are evicted); `set` may pass a shorter one for a single entry. Not
+    thread-safe on its own; callers that share it across threads lock around it.
+    """
+
+    def __init__(self, max_size, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _live(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at = entry[0]
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.expired += 1
+            return None
+        return entry
+
+    def get(self, key):
+        entry = self._live(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def peek(self, key):
+        """Like get, without counting a lookup or refreshing recency."""
+        entry = self._live(key)
+        return None if entry is None else entry[1]
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            ttl = self.ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
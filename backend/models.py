@@ -37,6 +37,11 @@ class Tool(BaseModel):
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
+# Fields rendered by the catalog cards; the default /api/tools list view
+TOOL_CARD_FIELDS = ("id", "name", "description", "image", "category", "pricing", "tags", "featured")
+# Excludes Mongo's _id and the loader's upsert key, which are not Tool fields
+TOOL_PUBLIC_PROJECTION = {"_id": 0, "naturalKey": 0}
+
 class ToolCreate(BaseModel):
     name: str
     description: str
@@ -59,6 +64,15 @@ class ToolUpdate(BaseModel):
     url: Optional[str] = None
     featured: Optional[bool] = None
 
+class ToolBulkUpdate(ToolUpdate):
+    id: str
+
+class ToolBulkRequest(BaseModel):
+    # Items are validated one by one so a bad item fails alone, not the batch
+    create: List[dict] = []
+    update: List[dict] = []
+    delete: List[str] = []
+
 class ToolSubmission(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
@@ -85,6 +99,10 @@ class ToolSubmissionCreate(BaseModel):
     url: str
     submitterEmail: EmailStr
 
+class SubmissionBatchAction(BaseModel):
+    approve: List[str] = []
+    reject: List[str] = []
+
 class Favorite(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     userId: str
@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+
+from pymongo import monitoring
+
+
+# Environment variable -> (MongoClient option, parser). Unset variables keep
+# the driver defaults.
+CLIENT_OPTIONS = {
+    "MONGO_MAX_POOL_SIZE": ("maxPoolSize", int),
+    "MONGO_MIN_POOL_SIZE": ("minPoolSize", int),
+    "MONGO_MAX_IDLE_TIME_MS": ("maxIdleTimeMS", int),
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": ("waitQueueTimeoutMS", int),
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": ("serverSelectionTimeoutMS", int),
+    "MONGO_CONNECT_TIMEOUT_MS": ("connectTimeoutMS", int),
+    "MONGO_SOCKET_TIMEOUT_MS": ("socketTimeoutMS", int),
+    # e.g. "zstd,snappy,zlib"; zstd and snappy need their optional packages
+    "MONGO_COMPRESSORS": ("compressors", str),
+    "MONGO_ZLIB_COMPRESSION_LEVEL": ("zlibCompressionLevel", int),
+}
+
+
+def client_options_from_env(environ=os.environ):
+    options = {}
+    for variable, (option, parse) in CLIENT_OPTIONS.items():
+        value = environ.get(variable)
+        if value not in (None, ""):
+            options[option] = parse(value)
+    return options
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Connection pool counters and checkout wait times.
+
+    Checkouts run on the calling (Motor executor) thread, so the start time
+    is kept thread-locally to pair the started and finished events.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.counters = {
+            "connectionsOpen": 0,
+            "connectionsCreated": 0,
+            "connectionsClosed": 0,
+            "checkedOut": 0,
+            "checkoutsSucceeded": 0,
+            "checkoutsFailed": 0,
+            "poolsCleared": 0,
+        }
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _add(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                self.counters[name] += delta
+
+    def _waited(self):
+        started = getattr(self._local, "started", None)
+        if started is None:
+            return 0.0
+        self._local.started = None
+        return time.perf_counter() - started
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add(poolsCleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._add(connectionsOpen=1, connectionsCreated=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add(connectionsOpen=-1, connectionsClosed=1)
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._waited()
+        self._add(checkoutsFailed=1)
+
+    def connection_checked_out(self, event):
+        waited = self._waited()
+        with self._lock:
+            self.counters["checkedOut"] += 1
+            self.counters["checkoutsSucceeded"] += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def connection_checked_in(self, event):
+        self._add(checkedOut=-1)
+
+    def stats(self):
+        with self._lock:
+            succeeded = self.counters["checkoutsSucceeded"]
+            return {
+                **self.counters,
+                "avgCheckoutWaitMs": round(self.wait_total / succeeded * 1000, 3) if succeeded else 0.0,
+                "maxCheckoutWaitMs": round(self.wait_max * 1000, 3),
+            }
@@ -0,0 +1,96 @@
+import base64
+import json
+from bisect import bisect_right
+from datetime import datetime
+
+from fastapi import HTTPException
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# bool is an int subclass, so it passes too
+CURSOR_VALUE_TYPES = (str, int, float, datetime)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def _decode_value(obj):
+    if set(obj) == {"$dt"}:
+        return datetime.fromisoformat(obj["$dt"])
+    return obj
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, default=_encode_value, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw, object_hook=_decode_value)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Values go straight into a Mongo filter; an object could be an operator
+    if not all(value is None or isinstance(value, CURSOR_VALUE_TYPES) for value in values):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def keyset_filter(sort, values):
+    # (a, b) > (x, y)  <=>  a > x  OR  (a == x AND b > y)
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {sort[j][0]: values[j] for j in range(i)}
+        clause[field] = {"$gt" if direction == 1 else "$lt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+def after_cursor(query, sort, cursor):
+    if not cursor:
+        return query
+    after = keyset_filter(sort, decode_cursor(cursor, len(sort)))
+    return {"$and": [query, after]} if query else after
+
+
+def split_page(docs, sort, limit):
+    # Callers fetch limit + 1 rows; the extra row only signals another page
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_cursor([docs[-1][field] for field, _ in sort])
+
+
+def ranked_page(hits, limit, cursor=None):
+    """Slice one page from (score, id) hits ordered by score desc, then id.
+
+    The cursor is the last hit of the previous page; paging resumes after
+    its position, so a hit whose score changed in between is not repeated.
+    """
+    start = 0
+    if cursor:
+        score, hit_id = decode_cursor(cursor, 2)
+        if not isinstance(score, (int, float)) or not isinstance(hit_id, str):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        start = bisect_right(hits, (-score, hit_id), key=lambda hit: (-hit[0], hit[1]))
+    page = hits[start:start + limit]
+    next_cursor = encode_cursor(list(page[-1])) if start + limit < len(hits) else None
+    return page, next_cursor
+
+
+async def paginate(collection, query, projection, sort, limit, cursor=None):
+    """Fetch one page ordered by `sort`, which must end in a unique field.
+
+    Returns the documents and the cursor for the next page, or None when
+    this is the last page.
+    """
+    query = after_cursor(query, sort, cursor)
+    docs = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(limit + 1)
+    return split_page(docs, sort, limit)
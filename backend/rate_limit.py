@@ -0,0 +1,161 @@
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, Request, status
+from pymongo import ReturnDocument
+
+
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "1") == "1"
+# "memory" is per worker; "mongo" shares counters across workers and hosts
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+# Only trust X-Forwarded-For when a proxy we control sets it
+TRUST_FORWARDED_FOR = os.environ.get("TRUST_FORWARDED_FOR", "0") == "1"
+
+
+def client_ip(request: Request):
+    if TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class MemoryRateLimitBackend:
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._windows = OrderedDict()
+
+    def _touch(self, store, key, default):
+        value = store.get(key)
+        if value is None:
+            store[key] = value = default()
+            while len(store) > self.max_keys:
+                store.popitem(last=False)
+        else:
+            store.move_to_end(key)
+        return value
+
+    async def token_bucket(self, key, capacity, refill_rate):
+        now = time.monotonic()
+        bucket = self._touch(self._buckets, key, lambda: [capacity, now])
+        bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+        bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return True, 0
+        return False, (1 - bucket[0]) / refill_rate
+
+    async def sliding_window(self, key, limit, window):
+        now = time.monotonic()
+        hits = self._touch(self._windows, key, deque)
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if len(hits) >= limit:
+            return False, hits[0] + window - now
+        hits.append(now)
+        return True, 0
+
+
+class MongoRateLimitBackend:
+    """Shared counters with single atomic pipeline updates per hit.
+
+    Documents carry `expiresAt` for the TTL index declared in indexes.py.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def token_bucket(self, key, capacity, refill_rate):
+        now = datetime.utcnow()
+        refilled = {"$min": [capacity, {"$add": [
+            {"$ifNull": ["$tokens", capacity]},
+            {"$multiply": [{"$divide": [{"$subtract": [now, {"$ifNull": ["$updatedAt", now]}]}, 1000]}, refill_rate]},
+        ]}]}
+        doc = await self.collection.find_one_and_update(
+            {"_id": f"tb:{key}"},
+            [
+                {"$set": {"tokens": refilled, "updatedAt": now}},
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+                {"$set": {
+                    "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    "expiresAt": now + timedelta(seconds=capacity / refill_rate),
+                }},
+            ],
+            upsert=True, return_document=ReturnDocument.AFTER
+        )
+        if doc["allowed"]:
+            return True, 0
+        return False, (1 - doc["tokens"]) / refill_rate
+
+    async def sliding_window(self, key, limit, window):
+        # Sliding-window counter: the previous fixed window is weighted by how
+        # much of it still overlaps the sliding window
+        now = time.time()
+        window_start = math.floor(now / window) * window
+        elapsed = now - window_start
+        same_window = {"$eq": ["$windowStart", window_start]}
+        # Like the memory backend, only allowed hits are counted, so a client
+        # that keeps retrying is let back in once the window slides
+        estimate = {"$add": [
+            {"$multiply": [{"$ifNull": ["$prevCount", 0]}, 1 - elapsed / window]},
+            {"$ifNull": ["$count", 0]},
+            1,
+        ]}
+        doc = await self.collection.find_one_and_update(
+            {"_id": f"sw:{key}"},
+            [
+                {"$set": {
+                    "prevCount": {"$cond": [same_window, "$prevCount", {"$cond": [
+                        {"$eq": ["$windowStart", window_start - window]}, "$count", 0
+                    ]}]},
+                    "count": {"$cond": [same_window, "$count", 0]},
+                    "windowStart": window_start,
+                    "expiresAt": datetime.utcnow() + timedelta(seconds=2 * window),
+                }},
+                {"$set": {"allowed": {"$lte": [estimate, limit]}}},
+                {"$set": {"count": {"$cond": [
+                    "$allowed", {"$add": [{"$ifNull": ["$count", 0]}, 1]}, {"$ifNull": ["$count", 0]}
+                ]}}},
+            ],
+            upsert=True, return_document=ReturnDocument.AFTER
+        )
+        if doc["allowed"]:
+            return True, 0
+        return False, window - elapsed
+
+
+class RateLimiter:
+    """A named limit, either a token bucket (`limit` burst refilled over
+    `period` seconds) or a sliding window (`limit` hits per `period`)."""
+
+    def __init__(self, name, limit, period, mode="token_bucket", backend=None):
+        if mode not in ("token_bucket", "sliding_window"):
+            raise ValueError(f"Unknown rate limit mode: {mode}")
+        self.name = name
+        self.limit = limit
+        self.period = period
+        self.mode = mode
+        self.backend = backend
+        self.rejected = 0
+
+    async def hit(self, key):
+        key = f"{self.name}:{key}"
+        if self.mode == "token_bucket":
+            return await self.backend.token_bucket(key, self.limit, self.limit / self.period)
+        return await self.backend.sliding_window(key, self.limit, self.period)
+
+    async def check(self, key):
+        if not RATE_LIMIT_ENABLED or key is None:
+            return
+        allowed, retry_after = await self.hit(key)
+        if not allowed:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
@@ -0,0 +1,189 @@
+import math
+from bisect import insort
+from collections import Counter
+
+import numpy as np
+
+from search_index import tokenize
+
+
+RELATED_FIELDS = ("name", "description", "longDescription", "tags")
+# Term-frequency multiplier per field; a shared name or tag says more than a
+# shared word deep in the long description
+FIELD_WEIGHTS = {"name": 3, "tags": 2, "description": 1, "longDescription": 1}
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has in into is it its of on or that the "
+    "their this to with your you our can all any more most no not".split()
+)
+DEFAULT_RELATED_LIMIT = 6
+MAX_RELATED_LIMIT = 20
+
+
+def term_counts(tool):
+    counts = Counter()
+    for field in RELATED_FIELDS:
+        value = tool.get(field)
+        texts = value if isinstance(value, list) else [value]
+        for text in texts:
+            for token in tokenize(text):
+                if len(token) > 1 and token not in STOP_WORDS:
+                    counts[token] += FIELD_WEIGHTS[field]
+    return counts
+
+
+class RelatedIndex:
+    """TF-IDF vectors per tool and cached nearest-neighbour lists.
+
+    Vectors are L2-normalised, so cosine similarity is a sparse dot product.
+    The catalog is held as one COO matrix (rows, cols, vals arrays) and the
+    similarities of one tool against all others are a single bincount.
+
+    IDF weights are fixed when the index is built; terms first seen on a later
+    write get their IDF from the counts at that moment. A reload rebuilds
+    everything with fresh weights. Writes are applied lazily: the next lookup
+    rebuilds the matrix once and patches every cached list with the changed
+    tools' new scores, instead of dropping the cache.
+    """
+
+    def __init__(self, pool_size=2 * MAX_RELATED_LIMIT):
+        # Cached lists keep more neighbours than any request needs, so that
+        # removing a few tools still leaves a complete answer
+        self.pool_size = pool_size
+        self.ready = False
+        self._vocab = {}
+        self._df = Counter()
+        self._idf = {}
+        self._counts = {}
+        self._vectors = {}
+        self._neighbours = {}
+        self._pending = set()
+        self._matrix = None
+
+    def __len__(self):
+        return len(self._vectors)
+
+    @staticmethod
+    def _compute_idf(n, df):
+        return math.log((1 + n) / (1 + df)) + 1
+
+    def _vectorize(self, counts):
+        if not counts:
+            return np.empty(0, np.int32), np.empty(0, np.float32)
+        cols = np.fromiter((self._vocab.setdefault(t, len(self._vocab)) for t in counts), np.int32, len(counts))
+        vals = np.fromiter(
+            ((1 + math.log(tf)) * self._idf[t] for t, tf in counts.items()), np.float32, len(counts)
+        )
+        return cols, vals / np.linalg.norm(vals)
+
+    def build(self, tools):
+        self._counts = {tool["id"]: term_counts(tool) for tool in tools}
+        self._df = Counter()
+        for counts in self._counts.values():
+            self._df.update(counts.keys())
+        n = len(self._counts)
+        self._idf = {term: self._compute_idf(n, df) for term, df in self._df.items()}
+        self._vocab = {}
+        self._vectors = {tool_id: self._vectorize(counts) for tool_id, counts in self._counts.items()}
+        self._neighbours = {}
+        self._pending = set()
+        self._matrix = None
+        self.ready = True
+
+    def add(self, tool):
+        tool_id = tool["id"]
+        self._forget(tool_id)
+        counts = term_counts(tool)
+        self._counts[tool_id] = counts
+        self._df.update(counts.keys())
+        n = len(self._counts)
+        for term in counts:
+            if term not in self._idf:
+                self._idf[term] = self._compute_idf(n, self._df[term])
+        self._vectors[tool_id] = self._vectorize(counts)
+        self._changed(tool_id)
+
+    def remove(self, tool_id):
+        if self._forget(tool_id):
+            self._changed(tool_id)
+
+    def _forget(self, tool_id):
+        counts = self._counts.pop(tool_id, None)
+        if counts is None:
+            return False
+        self._df.subtract(counts.keys())
+        del self._vectors[tool_id]
+        return True
+
+    def _changed(self, tool_id):
+        self._neighbours.pop(tool_id, None)
+        self._pending.add(tool_id)
+        self._matrix = None
+
+    def _ensure_matrix(self):
+        if self._matrix is not None:
+            return
+        ids = list(self._vectors)
+        vectors = [self._vectors[tool_id] for tool_id in ids]
+        lengths = [len(cols) for cols, _ in vectors]
+        if vectors:
+            cols = np.concatenate([cols for cols, _ in vectors])
+            vals = np.concatenate([vals for _, vals in vectors])
+        else:
+            cols, vals = np.empty(0, np.int32), np.empty(0, np.float32)
+        rows = np.repeat(np.arange(len(ids), dtype=np.int32), lengths)
+        self._matrix = (ids, {tool_id: row for row, tool_id in enumerate(ids)}, rows, cols, vals)
+
+    def _scores(self, tool_id):
+        ids, row_of, rows, cols, vals = self._matrix
+        query = np.zeros(len(self._vocab), np.float32)
+        tool_cols, tool_vals = self._vectors[tool_id]
+        query[tool_cols] = tool_vals
+        scores = np.bincount(rows, weights=vals * query[cols], minlength=len(ids))
+        scores[row_of[tool_id]] = 0
+        return scores
+
+    def _apply_pending(self):
+        self._ensure_matrix()
+        row_of = self._matrix[1]
+        for changed_id in self._pending:
+            scores = self._scores(changed_id) if changed_id in self._vectors else None
+            for tool_id, (entries, complete) in list(self._neighbours.items()):
+                entries[:] = [entry for entry in entries if entry[1] != changed_id]
+                if scores is None:
+                    continue
+                score = -float(scores[row_of[tool_id]])
+                # Entries are (-score, id); past the end of a truncated list
+                # the order is unknown, so only insert ahead of its last entry
+                if score < 0 and (complete or (entries and (score, changed_id) < entries[-1])):
+                    insort(entries, (score, changed_id))
+                    if len(entries) > self.pool_size:
+                        entries.pop()
+                        self._neighbours[tool_id] = (entries, False)
+        self._pending = set()
+
+    def related(self, tool_id, limit=DEFAULT_RELATED_LIMIT):
+        """Ids and cosine similarities of the `limit` most similar tools, or
+        None if the tool is not indexed. At most `pool_size` are returned."""
+        if tool_id not in self._vectors:
+            return None
+        if self._pending or self._matrix is None:
+            self._apply_pending()
+        cached = self._neighbours.get(tool_id)
+        if cached is None or (not cached[1] and len(cached[0]) < limit):
+            scores = self._scores(tool_id)
+            candidates = np.flatnonzero(scores > 0)
+            complete = len(candidates) <= self.pool_size
+            if not complete:
+                top = np.argpartition(-scores[candidates], self.pool_size)[:self.pool_size]
+                candidates = candidates[top]
+            ids = self._matrix[0]
+            cached = (sorted((-float(scores[row]), ids[row]) for row in candidates), complete)
+            self._neighbours[tool_id] = cached
+        return [(other_id, -score) for score, other_id in cached[0][:limit]]
+
+    def stats(self):
+        return {
+            "tools": len(self._vectors),
+            "terms": sum(1 for df in self._df.values() if df > 0),
+            "cachedNeighbourLists": len(self._neighbours),
+        }
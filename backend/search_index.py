@@ -0,0 +1,301 @@
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+from operator import itemgetter
+
+from fuzzy import TrigramIndex, fuzzy_terms
+
+
+WORD_RE = re.compile(r"[A-Za-z0-9]+")
+# Splits tags like "#AIWebsiteBuilder" into "AI", "Website", "Builder"
+CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+SEARCH_FIELDS = ("name", "description", "tags")
+# Fields scored by BM25 and their boosts; longDescription only affects the
+# order of tools that already match on the search fields
+FIELD_BOOSTS = {"name": 3.0, "tags": 2.0, "description": 1.0, "longDescription": 0.5}
+FEATURED_BOOST = 1.25
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Tokens a query term matches only as a prefix count for less than exact ones
+PREFIX_WEIGHT = 0.7
+# Scoring uses at most this many prefix expansions per query term; matching
+# still considers all of them
+MAX_EXPANSIONS = 50
+RANK_CACHE_SIZE = 256
+
+
+def tokenize(text, split_camel=True):
+    tokens = []
+    for word in WORD_RE.findall(text or ""):
+        tokens.append(word.lower())
+        if split_camel:
+            parts = CAMEL_RE.findall(word)
+            if len(parts) > 1:
+                tokens.extend(part.lower() for part in parts)
+    return tokens
+
+
+def field_term_counts(tool):
+    counts = {}
+    for field in FIELD_BOOSTS:
+        value = tool.get(field)
+        counts[field] = terms = Counter()
+        for text in value if isinstance(value, list) else [value]:
+            terms.update(tokenize(text))
+    return counts
+
+
+def tool_tokens(fields):
+    return set().union(*(fields[field] for field in SEARCH_FIELDS))
+
+
+class SearchIndex:
+    """In-memory inverted index over tool name, description and tags.
+
+    Every query term is matched as a prefix of an indexed token, so partial
+    words typed into the search box still match, and the per-term posting
+    lists are intersected to produce the candidate tool ids.
+
+    For ranking, each (token, tool) pair stores a precomputed BM25 impact:
+    the boosted sum of the per-field BM25 term-frequency parts. A query then
+    costs one idf multiplication per posting. Field length averages are taken
+    when a tool is indexed and refreshed by a rebuild.
+    """
+
+    def __init__(self, boosts=FIELD_BOOSTS, featured_boost=FEATURED_BOOST):
+        self.ready = False
+        self.boosts = boosts
+        self.featured_boost = featured_boost
+        self._postings = {}
+        self._doc_tokens = {}
+        self._vocab = []
+        self._vocab_dirty = False
+        self._impacts = {}
+        self._doc_meta = {}
+        self._field_totals = Counter()
+        self._featured = set()
+        self._fuzzy = TrigramIndex()
+        self._ranked = {}
+
+    def __len__(self):
+        return len(self._doc_tokens)
+
+    def __contains__(self, tool_id):
+        return tool_id in self._doc_tokens
+
+    def build(self, tools):
+        self._postings = {}
+        self._doc_tokens = {}
+        self._impacts = {}
+        self._doc_meta = {}
+        self._featured = set()
+        self._fuzzy = TrigramIndex()
+        self._ranked = {}
+        counts = [(tool, field_term_counts(tool)) for tool in tools]
+        # Averages over the whole catalog before any impact is computed
+        self._field_totals = Counter()
+        for _, fields in counts:
+            for field, terms in fields.items():
+                self._field_totals[field] += sum(terms.values())
+        for tool, fields in counts:
+            self._index(tool, fields, len(counts))
+        self._vocab = sorted(self._postings)
+        self._vocab_dirty = False
+        self.ready = True
+
+    def add(self, tool):
+        self.remove(tool["id"])
+        fields = field_term_counts(tool)
+        for field, terms in fields.items():
+            self._field_totals[field] += sum(terms.values())
+        self._index(tool, fields, len(self._doc_meta) + 1)
+
+    def remove(self, tool_id):
+        self._ranked = {}
+        self._featured.discard(tool_id)
+        self._fuzzy.remove(tool_id)
+        meta = self._doc_meta.pop(tool_id, None)
+        if meta is not None:
+            for field, length in meta["lengths"].items():
+                self._field_totals[field] -= length
+            for token in meta["tokens"]:
+                impacts = self._impacts.get(token)
+                if impacts is not None:
+                    impacts.pop(tool_id, None)
+                    if not impacts:
+                        del self._impacts[token]
+        tokens = self._doc_tokens.pop(tool_id, None)
+        if not tokens:
+            return
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(tool_id)
+            if not posting:
+                del self._postings[token]
+                self._vocab_dirty = True
+
+    def _index(self, tool, fields, docs):
+        tool_id = tool["id"]
+        self._ranked = {}
+        tokens = tool_tokens(fields)
+        self._doc_tokens[tool_id] = tokens
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                self._postings[token] = posting = set()
+                self._vocab_dirty = True
+            posting.add(tool_id)
+        self._index_impacts(tool, fields, docs)
+        self._fuzzy.add(tool_id, fuzzy_terms(tool))
+
+    def _index_impacts(self, tool, fields, docs):
+        tool_id = tool["id"]
+        lengths = {field: sum(terms.values()) for field, terms in fields.items()}
+        impacts = Counter()
+        for field, terms in fields.items():
+            average = self._field_totals[field] / docs or 1
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[field] / average)
+            for token, tf in terms.items():
+                impacts[token] += self.boosts[field] * tf * (BM25_K1 + 1) / (tf + norm)
+        for token, impact in impacts.items():
+            self._impacts.setdefault(token, {})[tool_id] = impact
+        self._doc_meta[tool_id] = {
+            "tokens": list(impacts),
+            "lengths": lengths,
+            "category": tool.get("category"),
+            "pricing": tool.get("pricing"),
+        }
+        if tool.get("featured"):
+            self._featured.add(tool_id)
+
+    def _refresh_vocab(self):
+        if self._vocab_dirty:
+            self._vocab = sorted(self._postings)
+            self._vocab_dirty = False
+
+    def _matching_ids(self, prefix):
+        self._refresh_vocab()
+        exact = self._postings.get(prefix)
+        ids = set(exact) if exact else set()
+        start = bisect_left(self._vocab, prefix)
+        for token in islice(self._vocab, start, None):
+            if not token.startswith(prefix):
+                break
+            if token != prefix:
+                ids.update(self._postings[token])
+        return ids
+
+    def search(self, text):
+        terms = sorted(set(tokenize(text, split_camel=False)), key=len, reverse=True)
+        if not terms:
+            return set()
+        result = None
+        # Longest terms first: they usually have the shortest posting lists
+        for term in terms:
+            ids = self._matching_ids(term)
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
+
+    def _expansions(self, term):
+        self._refresh_vocab()
+        expansions = [term] if term in self._postings else []
+        start = bisect_left(self._vocab, term)
+        for token in islice(self._vocab, start, None):
+            if len(expansions) >= MAX_EXPANSIONS or not token.startswith(term):
+                break
+            if token != term:
+                expansions.append(token)
+        return expansions
+
+    def rank(self, text, category=None, pricing=None, fuzzy=False):
+        """Matching tools as (score, id) pairs, best first, ties by id.
+
+        Scores are BM25, or with `fuzzy` the edit-distance similarity of the
+        closest name or tag.
+        """
+        key = (text, category, pricing, fuzzy)
+        ranked = self._ranked.get(key)
+        if ranked is not None:
+            return ranked
+        if fuzzy:
+            scores = self._fuzzy_scores(text)
+            candidates = scores
+        else:
+            candidates = self.search(text)
+        if category is not None or pricing is not None:
+            candidates = [
+                tool_id for tool_id in candidates
+                if (category is None or self._doc_meta[tool_id]["category"] == category)
+                and (pricing is None or self._doc_meta[tool_id]["pricing"] == pricing)
+            ]
+        if fuzzy:
+            ranked = [(scores[tool_id], tool_id) for tool_id in candidates]
+        else:
+            ranked = self._bm25(text, candidates)
+        # Two stable sorts: by id, then by score descending
+        ranked.sort(key=itemgetter(1))
+        ranked.sort(key=itemgetter(0), reverse=True)
+        if len(self._ranked) >= RANK_CACHE_SIZE:
+            self._ranked = {}
+        self._ranked[key] = ranked
+        return ranked
+
+    def _fuzzy_scores(self, text):
+        # Like search(), every query word must match, but a word also matches
+        # name words and tags within a few edits. Exact and prefix matches
+        # count as similarity 1; a tool scores its mean similarity per word
+        terms = set(tokenize(text, split_camel=False))
+        scores = None
+        for term in terms:
+            word_scores = self._fuzzy.search(term)
+            word_scores.update(dict.fromkeys(self._matching_ids(term), 1.0))
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {
+                    tool_id: score + word_scores[tool_id]
+                    for tool_id, score in scores.items() if tool_id in word_scores
+                }
+            if not scores:
+                return {}
+        return {tool_id: score / len(terms) for tool_id, score in (scores or {}).items()}
+
+    def _bm25(self, text, candidates):
+        scores = dict.fromkeys(candidates, 0.0)
+        docs = len(self._doc_meta)
+        for term in set(tokenize(text, split_camel=False)):
+            # A term scores by its best expansion, so "video" doesn't count
+            # twice for a tool that also mentions "videos"
+            best = {}
+            for token in self._expansions(term):
+                impacts = self._impacts.get(token)
+                if not impacts:
+                    continue
+                df = len(impacts)
+                weight = math.log(1 + (docs - df + 0.5) / (df + 0.5))
+                if token != term:
+                    weight *= PREFIX_WEIGHT
+                if len(scores) < len(impacts):
+                    found = {tool_id: weight * impacts[tool_id] for tool_id in scores if tool_id in impacts}
+                else:
+                    found = {tool_id: weight * impact for tool_id, impact in impacts.items() if tool_id in scores}
+                if not best:
+                    best = found
+                    continue
+                for tool_id, score in found.items():
+                    if score > best.get(tool_id, 0.0):
+                        best[tool_id] = score
+            for tool_id, score in best.items():
+                scores[tool_id] += score
+        featured, boost = self._featured, self.featured_boost
+        return [
+            (score * boost if tool_id in featured else score, tool_id)
+            for tool_id, score in scores.items()
+        ]
@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 from pathlib import Path
 from datetime import datetime
 import uuid
+from load_tools import load_records
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -185,13 +186,13 @@ mock_tools = [
 ]
 
 async def seed_db():
-    # Clear existing tools
-    await db.tools.delete_many({})
-    print("Cleared existing tools")
-    
-    # Insert new tools
-    result = await db.tools.insert_many(mock_tools)
-    print(f"Inserted {len(result.inserted_ids)} tools")
+    # Upsert on each tool's natural key so the live catalog is never emptied
+    stats = await load_records(db, enumerate(mock_tools, 1), progress=False)
+    print(f"Created {stats['created']}, updated {stats['updated']}, unchanged {stats['unchanged']} tools")
+    for key, tool_ids in stats["collisions"].items():
+        print(f"Name collision, naturalKey not assigned: '{key}' ({', '.join(tool_ids)})")
+    for index, error in stats["errors"]:
+        print(f"Tool {index}: {error}")
     
     client.close()
 
@@ -0,0 +1,67 @@
+import json
+import os
+from datetime import datetime
+
+from fastapi import Response
+
+from lru import LRUCache
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+FRAGMENT_CACHE_SIZE = int(os.environ.get("FRAGMENT_CACHE_SIZE", 20000))
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value):
+    if orjson is not None:
+        # orjson renders naive datetimes exactly like datetime.isoformat()
+        return orjson.dumps(value)
+    return json.dumps(value, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FragmentCache:
+    """Encoded JSON bytes per tool, keyed by (id, updatedAt, field subset).
+
+    An edit bumps updatedAt, so an old fragment is simply never looked up
+    again and ages out of the LRU.
+    """
+
+    def __init__(self, max_size=FRAGMENT_CACHE_SIZE):
+        self._entries = LRUCache(max_size)
+
+    def encode(self, tool, fields=None):
+        key = (tool["id"], tool.get("updatedAt"), fields)
+        fragment = self._entries.get(key)
+        if fragment is not None:
+            return fragment
+        if fields is not None:
+            tool = {field: tool[field] for field in fields if field in tool}
+        fragment = dumps(tool)
+        self._entries.set(key, fragment)
+        return fragment
+
+    def stats(self):
+        return self._entries.stats()
+
+
+def with_fields(fragment, **fields):
+    # Splice extra keys into an encoded object without re-encoding it
+    if not fields:
+        return fragment
+    extra = dumps(fields)
+    if fragment == b"{}":
+        return extra
+    return fragment[:-1] + b"," + extra[1:]
+
+
+class JSONBytesResponse(Response):
+    media_type = "application/json"
@@ -1,27 +1,64 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response
 from dotenv import load_dotenv
+from fastapi.responses import StreamingResponse, JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import ValidationError
+from pymongo import ReturnDocument, InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError
 import os
+import re
+import uuid
+import time
+import asyncio
 import logging
 from pathlib import Path
 from typing import List, Optional
-from datetime import timedelta
+from datetime import datetime, timedelta
 from models import (
     User, UserCreate, UserLogin, UserInDB,
-    Tool, ToolCreate, ToolUpdate,
-    ToolSubmission, ToolSubmissionCreate,
+    Tool, ToolCreate, ToolUpdate, ToolBulkUpdate, ToolBulkRequest, TOOL_CARD_FIELDS, TOOL_PUBLIC_PROJECTION,
+    ToolSubmission, ToolSubmissionCreate, SubmissionBatchAction,
     Favorite
 )
 from auth import (
-    get_password_hash, verify_password, create_access_token,
-    get_current_user, get_current_admin_user
+    get_password_hash_async, verify_password_async, create_access_token,
+    get_current_user, get_current_admin_user, get_optional_user,
+    get_password_pool_stats, password_pool, token_cache
+)
+from catalog_cache import CatalogCache
+from search_index import SearchIndex
+from suggest import SuggestIndex
+from counters import CounterAccumulator, COUNTER_FLUSH_INTERVAL, popularity
+from related import RelatedIndex, DEFAULT_RELATED_LIMIT, MAX_RELATED_LIMIT
+from indexes import ensure_indexes
+from facets import FacetCounts, FACET_PIPELINE
+from export import iter_ndjson, gzip_chunks, EXPORT_BATCH_SIZE
+from pagination import (
+    paginate, after_cursor, split_page, ranked_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+)
+from favorites_cache import FavoriteIdCache
+from serialization import FragmentCache, JSONBytesResponse, dumps, with_fields
+from rate_limit import (
+    RateLimiter, MemoryRateLimitBackend, MongoRateLimitBackend, RATE_LIMIT_BACKEND, client_ip
+)
+from mongo_pool import PoolStatsListener, client_options_from_env
+from metrics import MetricsMiddleware, MongoCommandListener, monitor_event_loop_lag, metrics_response
+from http_cache import (
+    make_etag, content_etag, page_etag, etag_matches, cache_headers, not_modified,
+    CATALOG_CACHE_CONTROL, STATIC_CACHE_CONTROL, PRIVATE_CACHE_CONTROL
 )
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+pool_stats = PoolStatsListener()
+# Pool sizes, timeouts and compression come from MONGO_* environment variables
+client = AsyncIOMotorClient(
+    mongo_url,
+    event_listeners=[MongoCommandListener(), pool_stats],
+    **client_options_from_env()
+)
 db = client[os.environ['DB_NAME']]
 # Create the main app without a prefix
 app = FastAPI()
@@ -33,18 +70,48 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+# In-process cache for tool listings, invalidated by every catalog write
+catalog_cache = CatalogCache()
+# Inverted index answering the `search` filter, built on startup
+search_index = SearchIndex()
+# Sorted name/tag completions behind /suggest, built alongside the search index
+suggest_index = SuggestIndex()
+# TF-IDF vectors and cached neighbour lists behind /tools/{id}/related
+related_index = RelatedIndex()
+# View and click counts, summed in memory and flushed to db.tool_stats
+tool_counters = CounterAccumulator(db.tool_stats)
+# Category/pricing counts, loaded by one aggregation and kept current on writes
+facet_counts = FacetCounts()
+# Per-user favorite tool ids, kept current by the favorites write routes
+favorite_ids_cache = FavoriteIdCache()
+# Pre-encoded JSON per tool; list bodies are assembled from these fragments
+tool_fragments = FragmentCache()
+# Throttles for the bcrypt-backed auth routes and the unauthenticated submission route
+if RATE_LIMIT_BACKEND == "mongo":
+    rate_limit_backend = MongoRateLimitBackend(db.rate_limits)
+else:
+    rate_limit_backend = MemoryRateLimitBackend()
+login_ip_limiter = RateLimiter("login-ip", 20, 60, "token_bucket", rate_limit_backend)
+login_email_limiter = RateLimiter("login-email", 5, 300, "sliding_window", rate_limit_backend)
+register_ip_limiter = RateLimiter("register-ip", 5, 3600, "sliding_window", rate_limit_backend)
+submission_ip_limiter = RateLimiter("submission-ip", 10, 3600, "sliding_window", rate_limit_backend)
+rate_limiters = [login_ip_limiter, login_email_limiter, register_ip_limiter, submission_ip_limiter]
 # ==================== AUTH ROUTES ====================
 @api_router.post("/auth/register")
-async def register(user_data: UserCreate):
+async def register(user_data: UserCreate, request: Request):
+    await register_ip_limiter.check(client_ip(request))
     # Check if user exists
     existing_user = await db.users.find_one({"email": user_data.email})
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     # Create user
     user_dict = user_data.dict()
-    user_dict["password"] = get_password_hash(user_data.password)
+    user_dict["password"] = await get_password_hash_async(user_data.password)
     user = UserInDB(**user_dict)
-    await db.users.insert_one(user.dict())
+    try:
+        await db.users.insert_one(user.dict())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     # Create token
     token = create_access_token(data={"sub": user.email, "userId": user.id, "isAdmin": user.isAdmin})
     return {
@@ -52,9 +119,13 @@ async def register(user_data: UserCreate):
         "token": token
     }
 @api_router.post("/auth/login")
-async def login(credentials: UserLogin):
+async def login(credentials: UserLogin, request: Request):
+    await login_ip_limiter.check(client_ip(request))
+    # Keyed per client too, so nobody can lock an account out by spraying
+    # attempts at its email from elsewhere
+    await login_email_limiter.check(f"{client_ip(request)}:{credentials.email.lower()}")
     user = await db.users.find_one({"email": credentials.email})
-    if not user or not verify_password(credentials.password, user["password"]):
+    if not user or not await verify_password_async(credentials.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     token = create_access_token(data={"sub": user["email"], "userId": user["id"], "isAdmin": user.get("isAdmin", False)})
     return {
@@ -67,56 +138,315 @@ async def get_me(current_user: dict = Depends(get_current_user)):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return {"user": {"id": user["id"], "name": user["name"], "email": user["email"], "isAdmin": user.get("isAdmin", False)}}
+# ==================== CATALOG SYNC ====================
+# Every route that writes to db.tools reports the change here so the
+# in-process catalog structures stay consistent with Mongo.
+def sync_tool_saved(tool: dict, previous: Optional[dict] = None):
+    catalog_cache.invalidate()
+    search_index.add(tool)
+    suggest_index.add(tool)
+    related_index.add(tool)
+    facet_counts.add(tool, previous)
+def sync_tool_deleted(tool: dict):
+    catalog_cache.invalidate()
+    search_index.remove(tool["id"])
+    suggest_index.remove(tool["id"])
+    related_index.remove(tool["id"])
+    facet_counts.remove(tool)
+async def get_favorite_ids(user_id: str):
+    ids = favorite_ids_cache.get(user_id)
+    if ids is None:
+        writes_seen = favorite_ids_cache.writes
+        ids = {fav["toolId"] async for fav in db.favorites.find({"userId": user_id}, {"_id": 0, "toolId": 1})}
+        favorite_ids_cache.set(user_id, ids, writes_seen)
+    return ids
 # ==================== TOOLS ROUTES ====================
+TOOL_FIELDS = frozenset(Tool.model_fields)
+# Always fetched: keyset pagination sorts on name/id, fragments are keyed on updatedAt
+TOOL_INTERNAL_FIELDS = ("id", "name", "updatedAt")
+def parse_tool_fields(fields: Optional[str], view: str):
+    if fields:
+        requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [f for f in requested if f not in TOOL_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        return requested
+    return TOOL_CARD_FIELDS if view == "card" else None
+def tool_projection(fields: Optional[tuple]):
+    if fields is None:
+        return TOOL_PUBLIC_PROJECTION
+    return {"_id": 0, **{field: 1 for field in set(fields) | set(TOOL_INTERNAL_FIELDS)}}
+async def ranked_search_page(search, category, pricing, fuzzy, limit, cursor, selected_fields):
+    # Relevance order lives in the search index: page through its ranked hits
+    # with a (score, id) keyset cursor and fetch only that page from Mongo
+    hits = search_index.rank(search, category, pricing, fuzzy)
+    page_hits, next_cursor = ranked_page(hits, limit, cursor)
+    ids = [tool_id for _, tool_id in page_hits]
+    found = {tool["id"]: tool async for tool in db.tools.find({"id": {"$in": ids}}, tool_projection(selected_fields))}
+    tools = [found[tool_id] for tool_id in ids if tool_id in found]
+    return tools, next_cursor
 @api_router.get("/tools")
 async def get_tools(
+    request: Request,
     search: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
-    pricing: Optional[str] = Query(None)
+    pricing: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    view: str = Query("card", pattern="^(card|full)$"),
+    sort: Optional[str] = Query(None, pattern="^(relevance|name)$"),
+    fuzzy: bool = Query(False),
+    current_user: Optional[dict] = Depends(get_optional_user)
 ):
+    selected_fields = parse_tool_fields(fields, view)
+    # Searches rank by relevance unless sort=name, fuzzy ones always by
+    # similarity; without the index they fall back to name order
+    ranked = bool(search) and search_index.ready and (fuzzy or sort != "name")
     query = {}
     if search:
-        query["$or"] = [
-            {"name": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}},
-            {"tags": {"$regex": search, "$options": "i"}}
-        ]
+        if search_index.ready:
+            if not ranked:
+                query["id"] = {"$in": list(search_index.search(search))}
+        else:
+            # Index not built yet (e.g. Mongo was unreachable at startup)
+            pattern = re.escape(search)
+            query["$or"] = [
+                {"name": {"$regex": pattern, "$options": "i"}},
+                {"description": {"$regex": pattern, "$options": "i"}},
+                {"tags": {"$regex": pattern, "$options": "i"}}
+            ]
     if category and category != "All":
         query["category"] = category
     if pricing and pricing != "All":
         query["pricing"] = pricing
-    tools = await db.tools.find(query, {"_id": 0}).sort("name", 1).to_list(1000)
-    return {"tools": tools}
+    cache_key = catalog_cache.make_key(search, category, pricing, limit, cursor, selected_fields, ranked, fuzzy)
+    user_id = current_user.get("userId") if current_user else None
+    cache_control = PRIVATE_CACHE_CONTROL if user_id else CATALOG_CACHE_CONTROL
+    page = catalog_cache.get(cache_key)
+    if page is None:
+        version = catalog_cache.version
+        if ranked:
+            tools, next_cursor = await ranked_search_page(
+                search, query.get("category"), query.get("pricing"), fuzzy, limit, cursor, selected_fields
+            )
+        else:
+            tools, next_cursor = await paginate(
+                db.tools, query, tool_projection(selected_fields), [("name", 1), ("id", 1)], limit, cursor
+            )
+        page = {
+            "tools": tools,
+            "next_cursor": next_cursor,
+            "etag": page_etag(cache_key, next_cursor, tools=tools),
+        }
+        catalog_cache.set(cache_key, page, version)
+    etag = page["etag"]
+    if user_id:
+        favorite_ids = await get_favorite_ids(user_id)
+        flags = [tool["id"] in favorite_ids for tool in page["tools"]]
+        etag = make_etag(etag, user_id, flags)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, cache_control, "Authorization")
+    fragments = [tool_fragments.encode(tool, selected_fields) for tool in page["tools"]]
+    if user_id:
+        fragments = [with_fields(fragment, isFavorite=flag) for fragment, flag in zip(fragments, flags)]
+    body = b'{"tools":[' + b",".join(fragments) + b'],"next_cursor":' + dumps(page["next_cursor"]) + b"}"
+    return JSONBytesResponse(body, headers=cache_headers(etag, cache_control, "Authorization"))
+@api_router.get("/tools/export")
+async def export_tools(
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=1, le=10000),
+    gzip: bool = Query(False)
+):
+    chunks = iter_ndjson(db.tools, batch_size=batch_size)
+    headers = {"Content-Disposition": 'attachment; filename="tools.ndjson"'}
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type="application/x-ndjson", headers=headers)
 @api_router.get("/tools/{tool_id}")
-async def get_tool(tool_id: str):
-    tool = await db.tools.find_one({"id": tool_id}, {"_id": 0})
-    if not tool:
+async def get_tool(
+    tool_id: str,
+    request: Request,
+    current_user: Optional[dict] = Depends(get_optional_user)
+):
+    cache_key = ("tool", tool_id)
+    tool = catalog_cache.get(cache_key)
+    if tool is None:
+        version = catalog_cache.version
+        tool = await db.tools.find_one({"id": tool_id}, TOOL_PUBLIC_PROJECTION)
+        if not tool:
+            raise HTTPException(status_code=404, detail="Tool not found")
+        catalog_cache.set(cache_key, tool, version)
+    tool_counters.incr(tool["id"], "views")
+    user_id = current_user.get("userId") if current_user else None
+    fragment = tool_fragments.encode(tool)
+    if user_id:
+        is_favorite = tool["id"] in await get_favorite_ids(user_id)
+        fragment = with_fields(fragment, isFavorite=is_favorite)
+        etag = make_etag(tool["id"], tool.get("updatedAt"), user_id, is_favorite)
+        cache_control = PRIVATE_CACHE_CONTROL
+    else:
+        etag = make_etag(tool["id"], tool.get("updatedAt"))
+        cache_control = CATALOG_CACHE_CONTROL
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, cache_control, "Authorization")
+    return JSONBytesResponse(b'{"tool":' + fragment + b"}", headers=cache_headers(etag, cache_control, "Authorization"))
+@api_router.post("/tools/{tool_id}/click", status_code=204)
+async def record_click(tool_id: str):
+    # Outbound-link beacon; counted in memory, never waits on Mongo. Ids are
+    # checked against the index so junk never reaches tool_stats
+    if tool_id not in search_index:
         raise HTTPException(status_code=404, detail="Tool not found")
-    return {"tool": tool}
+    tool_counters.incr(tool_id, "clicks")
+    return Response(status_code=204)
+@api_router.get("/tools/{tool_id}/related")
+async def get_related_tools(
+    tool_id: str,
+    request: Request,
+    limit: int = Query(DEFAULT_RELATED_LIMIT, ge=1, le=MAX_RELATED_LIMIT)
+):
+    cache_key = ("related", tool_id, limit)
+    cached = catalog_cache.get(cache_key)
+    if cached is None:
+        version = catalog_cache.version
+        projection = tool_projection(TOOL_CARD_FIELDS)
+        if related_index.ready:
+            neighbours = related_index.related(tool_id, limit)
+            if neighbours is None:
+                raise HTTPException(status_code=404, detail="Tool not found")
+            ids = [other_id for other_id, _ in neighbours]
+            found = {tool["id"]: tool async for tool in db.tools.find({"id": {"$in": ids}}, projection)}
+            tools = [found[other_id] for other_id in ids if other_id in found]
+        else:
+            # Index not built yet: fall back to the tool's own category
+            tool = await db.tools.find_one({"id": tool_id}, {"_id": 0, "category": 1})
+            if not tool:
+                raise HTTPException(status_code=404, detail="Tool not found")
+            query = {"category": tool.get("category"), "id": {"$ne": tool_id}}
+            tools = await db.tools.find(query, projection).sort([("name", 1), ("id", 1)]).to_list(limit)
+        cached = (tools, page_etag("related", tool_id, limit, tools=tools))
+        catalog_cache.set(cache_key, cached, version)
+    tools, etag = cached
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    fragments = [tool_fragments.encode(tool, TOOL_CARD_FIELDS) for tool in tools]
+    body = b'{"tools":[' + b",".join(fragments) + b"]}"
+    return JSONBytesResponse(body, headers=cache_headers(etag))
 @api_router.post("/tools")
 async def create_tool(tool_data: ToolCreate, current_user: dict = Depends(get_current_admin_user)):
     tool = Tool(**tool_data.dict())
     await db.tools.insert_one(tool.dict())
+    sync_tool_saved(tool.dict())
     return {"tool": tool}
+MAX_BULK_ITEMS = 1000
+@api_router.post("/tools/bulk")
+async def bulk_tools(bulk: ToolBulkRequest, current_user: dict = Depends(get_current_admin_user)):
+    if len(bulk.create) + len(bulk.update) + len(bulk.delete) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} items per request")
+    results = {"create": [], "update": [], "delete": []}
+    ops, pending = [], []
+    # Pre-images for updates and deletes, fetched in one query, keep the
+    # in-memory catalog structures consistent and detect missing tools
+    target_ids = [item.get("id") for item in bulk.update] + bulk.delete
+    existing = {}
+    if target_ids:
+        async for tool in db.tools.find({"id": {"$in": target_ids}}, {"_id": 0}):
+            existing[tool["id"]] = tool
+    for index, item in enumerate(bulk.create):
+        try:
+            tool = Tool(**ToolCreate(**item).dict()).dict()
+        except ValidationError as e:
+            results["create"].append({"index": index, "status": "error", "error": e.errors(include_url=False)})
+            continue
+        ops.append(InsertOne(tool))
+        pending.append(("create", index, tool, None))
+    # Each id may appear once across update and delete: every in-memory sync
+    # starts from the single pre-image fetched above
+    seen_ids = set()
+    duplicate = "Tool id appears more than once in this request"
+    now = datetime.utcnow()
+    for index, item in enumerate(bulk.update):
+        try:
+            update = ToolBulkUpdate(**item)
+        except ValidationError as e:
+            results["update"].append({"index": index, "status": "error", "error": e.errors(include_url=False)})
+            continue
+        if update.id in seen_ids:
+            results["update"].append({"index": index, "id": update.id, "status": "error", "error": duplicate})
+            continue
+        seen_ids.add(update.id)
+        previous = existing.get(update.id)
+        if previous is None:
+            results["update"].append({"index": index, "id": update.id, "status": "error", "error": "Tool not found"})
+            continue
+        update_data = {k: v for k, v in update.dict(exclude={"id"}).items() if v is not None}
+        if not update_data:
+            results["update"].append({"index": index, "id": update.id, "status": "unchanged"})
+            continue
+        update_data["updatedAt"] = now
+        ops.append(UpdateOne({"id": update.id}, {"$set": update_data}))
+        pending.append(("update", index, {**previous, **update_data}, previous))
+    for index, tool_id in enumerate(bulk.delete):
+        if tool_id in seen_ids:
+            results["delete"].append({"index": index, "id": tool_id, "status": "error", "error": duplicate})
+            continue
+        seen_ids.add(tool_id)
+        previous = existing.get(tool_id)
+        if previous is None:
+            results["delete"].append({"index": index, "id": tool_id, "status": "error", "error": "Tool not found"})
+            continue
+        ops.append(DeleteOne({"id": tool_id}))
+        pending.append(("delete", index, previous, None))
+    failed = {}
+    if ops:
+        try:
+            await db.tools.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"]: error["errmsg"] for error in e.details.get("writeErrors", [])}
+    statuses = {"create": "created", "update": "updated", "delete": "deleted"}
+    for op_index, (kind, index, tool, previous) in enumerate(pending):
+        if op_index in failed:
+            results[kind].append({"index": index, "id": tool["id"], "status": "error", "error": failed[op_index]})
+            continue
+        if kind == "delete":
+            sync_tool_deleted(tool)
+        else:
+            sync_tool_saved(tool, previous)
+        results[kind].append({"index": index, "id": tool["id"], "status": statuses[kind]})
+    for kind in results:
+        results[kind].sort(key=lambda result: result["index"])
+    errors = sum(1 for items in results.values() for result in items if result["status"] == "error")
+    return {"results": results, "errors": errors}
 @api_router.put("/tools/{tool_id}")
 async def update_tool(tool_id: str, tool_data: ToolUpdate, current_user: dict = Depends(get_current_admin_user)):
-    tool = await db.tools.find_one({"id": tool_id}, {"_id": 0})
-    if not tool:
-        raise HTTPException(status_code=404, detail="Tool not found")
     update_data = {k: v for k, v in tool_data.dict().items() if v is not None}
-    if update_data:
-        await db.tools.update_one({"id": tool_id}, {"$set": update_data})
-    updated_tool = await db.tools.find_one({"id": tool_id}, {"_id": 0})
+    if not update_data:
+        tool = await db.tools.find_one({"id": tool_id}, TOOL_PUBLIC_PROJECTION)
+        if not tool:
+            raise HTTPException(status_code=404, detail="Tool not found")
+        return {"tool": tool}
+    update_data["updatedAt"] = datetime.utcnow()
+    # The pre-image lets the in-memory facet counts move the tool between buckets
+    previous = await db.tools.find_one_and_update(
+        {"id": tool_id}, {"$set": update_data},
+        projection=TOOL_PUBLIC_PROJECTION, return_document=ReturnDocument.BEFORE
+    )
+    if not previous:
+        raise HTTPException(status_code=404, detail="Tool not found")
+    updated_tool = {**previous, **update_data}
+    sync_tool_saved(updated_tool, previous)
     return {"tool": updated_tool}
 @api_router.delete("/tools/{tool_id}")
 async def delete_tool(tool_id: str, current_user: dict = Depends(get_current_admin_user)):
-    result = await db.tools.delete_one({"id": tool_id})
-    if result.deleted_count == 0:
+    tool = await db.tools.find_one_and_delete({"id": tool_id}, projection={"_id": 0})
+    if not tool:
         raise HTTPException(status_code=404, detail="Tool not found")
+    sync_tool_deleted(tool)
     return {"message": "Tool deleted successfully"}
 # ==================== SUBMISSIONS ROUTES ====================
 @api_router.post("/submissions")
-async def create_submission(submission_data: ToolSubmissionCreate):
+async def create_submission(submission_data: ToolSubmissionCreate, request: Request):
+    await submission_ip_limiter.check(client_ip(request))
     tags_list = [tag.strip() for tag in submission_data.tags.split(',')]
     submission = ToolSubmission(
         name=submission_data.name,
@@ -132,16 +462,24 @@ async def create_submission(submission_data: ToolSubmissionCreate):
     await db.submissions.insert_one(submission.dict())
     return {"submission": submission}
 @api_router.get("/submissions")
-async def get_submissions(current_user: dict = Depends(get_current_admin_user)):
-    submissions = await db.submissions.find().to_list(1000)
-    return {"submissions": submissions}
-@api_router.put("/submissions/{submission_id}/approve")
-async def approve_submission(submission_id: str, current_user: dict = Depends(get_current_admin_user)):
-    submission = await db.submissions.find_one({"id": submission_id})
-    if not submission:
-        raise HTTPException(status_code=404, detail="Submission not found")
-    # Create tool from submission
-    tool = Tool(
+async def get_submissions(
+    status: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    query = {"status": status} if status else {}
+    submissions, next_cursor = await paginate(
+        db.submissions, query, {"_id": 0}, [("createdAt", -1), ("id", -1)], limit, cursor
+    )
+    return {"submissions": submissions, "next_cursor": next_cursor}
+# An "approving" claim older than this was abandoned (crash, timeout) and can be retaken
+SUBMISSION_CLAIM_LEASE = timedelta(minutes=5)
+MAX_BATCH_SUBMISSIONS = 1000
+def tool_from_submission(submission: dict):
+    # Derived id: a retried approval collides with the first insert instead of duplicating it
+    return Tool(
+        id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"aibox-submission:{submission['id']}")),
         name=submission["name"],
         description=submission["description"],
         longDescription=submission["longDescription"],
@@ -152,45 +490,226 @@ async def approve_submission(submission_id: str, current_user: dict = Depends(ge
         url=submission["url"],
         featured=False
     )
-    await db.tools.insert_one(tool.dict())
-    await db.submissions.update_one({"id": submission_id}, {"$set": {"status": "approved"}})
-    return {"tool": tool}
+async def claim_submission(submission_id: str, status: str, now: datetime):
+    update = {"status": status, "updatedAt": now}
+    claimable = [{"status": "pending"}]
+    if status == "approving":
+        update["claimedAt"] = now
+        # Only an approval may resume a stale claim: its insert may already
+        # have gone through, and the derived tool id makes a retry safe
+        claimable.append({"status": "approving", "claimedAt": {"$lt": now - SUBMISSION_CLAIM_LEASE}})
+    return await db.submissions.find_one_and_update(
+        {"id": submission_id, "$or": claimable},
+        {"$set": update},
+        # No _id exclusion: mongomock re-reads the updated document by _id
+        return_document=ReturnDocument.AFTER
+    )
+async def process_submissions(approve_ids: List[str], reject_ids: List[str]):
+    now = datetime.utcnow()
+    approve_ids = list(dict.fromkeys(approve_ids))
+    reject_ids = list(dict.fromkeys(reject_ids))
+    results = {"approve": [], "reject": []}
+    # Ambiguous ids are applied to neither list and reported once, under approve
+    conflicting = set(approve_ids) & set(reject_ids)
+    for submission_id in approve_ids:
+        if submission_id in conflicting:
+            results["approve"].append({"id": submission_id, "status": "error", "error": "Listed for both approve and reject"})
+    approve_ids = [submission_id for submission_id in approve_ids if submission_id not in conflicting]
+    reject_ids = [submission_id for submission_id in reject_ids if submission_id not in conflicting]
+    # Claim atomically on status so concurrent or repeated requests never process twice
+    claims = await asyncio.gather(
+        *[claim_submission(submission_id, "approving", now) for submission_id in approve_ids],
+        *[claim_submission(submission_id, "rejected", now) for submission_id in reject_ids]
+    )
+    approved_claims = [claim for claim in claims[:len(approve_ids)] if claim]
+    unclaimed = [
+        submission_id for submission_id, claim in zip(approve_ids + reject_ids, claims) if claim is None
+    ]
+    reasons = {}
+    if unclaimed:
+        async for submission in db.submissions.find({"id": {"$in": unclaimed}}, {"_id": 0, "id": 1, "status": 1}):
+            reasons[submission["id"]] = f"Submission already {submission['status']}"
+    for kind, ids, kind_claims in (
+        ("approve", approve_ids, claims[:len(approve_ids)]),
+        ("reject", reject_ids, claims[len(approve_ids):])
+    ):
+        for submission_id, claim in zip(ids, kind_claims):
+            if claim is None:
+                error = reasons.get(submission_id, "Submission not found")
+                results[kind].append({"id": submission_id, "status": "error", "error": error})
+            elif kind == "reject":
+                results[kind].append({"id": submission_id, "status": "rejected"})
+    tools = [tool_from_submission(claim).dict() for claim in approved_claims]
+    failed, duplicates = {}, set()
+    if tools:
+        try:
+            # Copies: insert_many adds an ObjectId _id to each dict it is given
+            await db.tools.insert_many([dict(tool) for tool in tools], ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                tool_id = tools[error["index"]]["id"]
+                if error["code"] == 11000:
+                    # Inserted by an earlier, interrupted attempt
+                    duplicates.add(tool_id)
+                else:
+                    failed[tool_id] = error["errmsg"]
+    ops, approved_tools = [], {}
+    for claim, tool in zip(approved_claims, tools):
+        if tool["id"] in failed:
+            ops.append(UpdateOne(
+                {"id": claim["id"], "status": "approving"},
+                {"$set": {"status": "pending"}, "$unset": {"claimedAt": ""}}
+            ))
+            results["approve"].append({"id": claim["id"], "status": "error", "error": failed[tool["id"]]})
+            continue
+        ops.append(UpdateOne(
+            {"id": claim["id"], "status": "approving"},
+            {"$set": {"status": "approved", "updatedAt": now}, "$unset": {"claimedAt": ""}}
+        ))
+        if tool["id"] not in duplicates:
+            sync_tool_saved(tool)
+        approved_tools[claim["id"]] = tool
+        results["approve"].append({"id": claim["id"], "status": "approved", "toolId": tool["id"]})
+    if ops:
+        await db.submissions.bulk_write(ops, ordered=False)
+    return results, approved_tools
+@api_router.post("/submissions/batch")
+async def batch_submissions(action: SubmissionBatchAction, current_user: dict = Depends(get_current_admin_user)):
+    if len(action.approve) + len(action.reject) > MAX_BATCH_SUBMISSIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SUBMISSIONS} submissions per request")
+    results, _ = await process_submissions(action.approve, action.reject)
+    errors = sum(1 for items in results.values() for result in items if result["status"] == "error")
+    return {"results": results, "errors": errors}
+@api_router.put("/submissions/{submission_id}/approve")
+async def approve_submission(submission_id: str, current_user: dict = Depends(get_current_admin_user)):
+    results, approved_tools = await process_submissions([submission_id], [])
+    result = results["approve"][0]
+    if result["status"] == "error":
+        if result["error"] == "Submission not found":
+            status_code = 404
+        elif result["error"].startswith("Submission already"):
+            status_code = 409
+        else:
+            status_code = 500
+        raise HTTPException(status_code=status_code, detail=result["error"])
+    return {"tool": approved_tools[submission_id]}
 # ==================== FAVORITES ROUTES ====================
 @api_router.get("/favorites")
-async def get_favorites(current_user: dict = Depends(get_current_user)):
+async def get_favorites(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    current_user: dict = Depends(get_current_user)
+):
     user_id = current_user["userId"]
-    favorites = await db.favorites.find({"userId": user_id}).to_list(1000)
-    # Get tool details for each favorite
-    tool_ids = [fav["toolId"] for fav in favorites]
-    tools = await db.tools.find({"id": {"$in": tool_ids}}, {"_id": 0}).to_list(1000)
-    return {"favorites": tools}
+    sort = [("createdAt", 1), ("id", 1)]
+    # Page through favorites and join the tool documents in one round trip
+    pipeline = [
+        {"$match": after_cursor({"userId": user_id}, sort, cursor)},
+        {"$sort": dict(sort)},
+        {"$limit": limit + 1},
+        # Plain equality $lookup: a sub-pipeline alongside localField needs MongoDB 5.0
+        {"$lookup": {
+            "from": "tools",
+            "localField": "toolId",
+            "foreignField": "id",
+            "as": "tool"
+        }},
+        {"$project": {"_id": 0, "id": 1, "createdAt": 1, "tool": {"$arrayElemAt": ["$tool", 0]}}},
+        {"$project": {"tool._id": 0, "tool.naturalKey": 0}}
+    ]
+    rows = await db.favorites.aggregate(pipeline).to_list(limit + 1)
+    rows, next_cursor = split_page(rows, sort, limit)
+    # Favorites of since-deleted tools have no match and are skipped
+    return {
+        "favorites": [row["tool"] for row in rows if row.get("tool")],
+        "next_cursor": next_cursor
+    }
 @api_router.post("/favorites/{tool_id}")
 async def add_favorite(tool_id: str, current_user: dict = Depends(get_current_user)):
     user_id = current_user["userId"]
-    # Check if already favorited
-    existing = await db.favorites.find_one({"userId": user_id, "toolId": tool_id})
-    if existing:
-        return {"message": "Already in favorites"}
     favorite = Favorite(userId=user_id, toolId=tool_id)
-    await db.favorites.insert_one(favorite.dict())
+    # Upsert on the unique (userId, toolId) pair instead of read-then-insert
+    try:
+        result = await db.favorites.update_one(
+            {"userId": user_id, "toolId": tool_id},
+            {"$setOnInsert": favorite.dict()},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # Lost a race with a concurrent upsert of the same pair
+        result = None
+    favorite_ids_cache.add(user_id, tool_id)
+    if result is None or result.upserted_id is None:
+        return {"message": "Already in favorites"}
     return {"message": "Added to favorites"}
 @api_router.delete("/favorites/{tool_id}")
 async def remove_favorite(tool_id: str, current_user: dict = Depends(get_current_user)):
     user_id = current_user["userId"]
     result = await db.favorites.delete_one({"userId": user_id, "toolId": tool_id})
+    favorite_ids_cache.discard(user_id, tool_id)
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Favorite not found")
     return {"message": "Removed from favorites"}
 # ==================== CATEGORIES ROUTE ====================
+CATEGORIES = [
+    'All', 'Website Builder', 'Advertising', 'Education',
+    'Productivity', 'NoCode', 'Video Generation', 'Automation',
+    'AI Detection', 'Text-to-Video', 'Marketing', 'Writing',
+    'Image Generation', 'Audio', 'Code Assistant'
+]
+CATEGORIES_ETAG = make_etag(CATEGORIES)
 @api_router.get("/categories")
-async def get_categories():
-    categories = [
-        'All', 'Website Builder', 'Advertising', 'Education',
-        'Productivity', 'NoCode', 'Video Generation', 'Automation',
-        'AI Detection', 'Text-to-Video', 'Marketing', 'Writing',
-        'Image Generation', 'Audio', 'Code Assistant'
-    ]
-    return {"categories": categories}
+async def get_categories(request: Request, response: Response):
+    if etag_matches(request.headers.get("if-none-match"), CATEGORIES_ETAG):
+        return not_modified(CATEGORIES_ETAG, STATIC_CACHE_CONTROL)
+    response.headers.update(cache_headers(CATEGORIES_ETAG, STATIC_CACHE_CONTROL))
+    return {"categories": CATEGORIES}
+# ==================== FACETS ROUTE ====================
+@api_router.get("/facets")
+async def get_facets(request: Request, response: Response):
+    if not facet_counts.ready:
+        result = await db.tools.aggregate(FACET_PIPELINE).to_list(1)
+        facet_counts.load(result[0])
+    facets = facet_counts.as_dict()
+    etag = content_etag(facets)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    return {"facets": facets}
+# ==================== SUGGEST ROUTE ====================
+@api_router.get("/suggest")
+async def suggest(
+    request: Request,
+    response: Response,
+    q: str = Query("", max_length=100),
+    limit: int = Query(8, ge=1, le=20)
+):
+    # Served entirely from memory; a leading "#" restricts completions to tags
+    result = suggest_index.suggest(q, limit)
+    etag = content_etag(result)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    return result
+# ==================== ADMIN STATS ROUTE ====================
+@api_router.get("/admin/stats")
+async def get_admin_stats(current_user: dict = Depends(get_current_admin_user)):
+    return {
+        "catalogCache": catalog_cache.stats(),
+        "passwordPool": get_password_pool_stats(),
+        "tokenCache": token_cache.stats(),
+        "favoritesCache": favorite_ids_cache.stats(),
+        "toolFragments": tool_fragments.stats(),
+        "rateLimits": {limiter.name: {"rejected": limiter.rejected} for limiter in rate_limiters},
+        "mongoPool": pool_stats.stats(),
+        "relatedIndex": related_index.stats(),
+        "toolCounters": tool_counters.stats()
+    }
+@api_router.post("/admin/reload")
+async def reload_catalog_state(current_user: dict = Depends(get_current_admin_user)):
+    # For writes made outside the API, e.g. load_tools.py
+    await reload_catalog()
+    return {"message": "Catalog reloaded", "tools": len(search_index)}
 # ==================== SEED DATA ROUTE ====================
 @api_router.post("/seed")
 async def seed_data():
@@ -199,8 +718,6 @@ async def seed_data():
     if existing_tools > 0:
         return {"message": "Data already seeded"}
     # Seed tools from mockData
-    from datetime import datetime
-    import uuid
     mock_tools = [
         {
             "id": str(uuid.uuid4()),
@@ -232,9 +749,42 @@ async def seed_data():
         }
     ]
     await db.tools.insert_many(mock_tools)
+    for tool in mock_tools:
+        sync_tool_saved(tool)
     return {"message": f"Seeded {len(mock_tools)} tools successfully"}
 # Include the router in the main app
 app.include_router(api_router)
+# Prometheus scrape endpoint, outside /api like a load balancer probe
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return metrics_response()
+# Liveness: the process is up and serving
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    return {"status": "ok"}
+READINESS_PING_BUDGET = float(os.environ.get("READINESS_PING_BUDGET_MS", 500)) / 1000
+# Readiness: Mongo answers a ping within the latency budget
+@app.get("/readyz", include_in_schema=False)
+async def readyz():
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), READINESS_PING_BUDGET)
+        error = None
+    except asyncio.TimeoutError:
+        error = f"ping exceeded {READINESS_PING_BUDGET * 1000:.0f}ms budget"
+    except Exception as e:
+        error = str(e)
+    body = {
+        "status": "ok" if error is None else "unavailable",
+        "mongoPingMs": round((time.perf_counter() - started) * 1000, 2),
+        "searchIndexReady": search_index.ready,
+        "pool": pool_stats.stats()
+    }
+    if error is not None:
+        body["error"] = error
+        return JSONResponse(body, status_code=503)
+    return body
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -242,9 +792,65 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+@app.on_event("startup")
+async def create_indexes():
+    try:
+        await ensure_indexes(db)
+    except Exception:
+        logger.exception("Failed to reconcile MongoDB indexes")
+async def reload_catalog():
+    catalog_cache.invalidate()
+    await build_catalog_indexes()
+    await load_facet_counts()
+    await load_popularity()
+@app.on_event("startup")
+async def build_catalog_indexes():
+    # One scan feeds every in-memory index over the catalog
+    try:
+        projection = {
+            "_id": 0, "id": 1, "name": 1, "description": 1, "longDescription": 1, "tags": 1,
+            "featured": 1, "category": 1, "pricing": 1
+        }
+        tools = [tool async for tool in db.tools.find({}, projection)]
+        search_index.build(tools)
+        suggest_index.build(tools)
+        related_index.build(tools)
+        logger.info("Catalog indexes built with %d tools", len(search_index))
+    except Exception:
+        logger.exception("Failed to build catalog indexes, falling back to regex search")
+@app.on_event("startup")
+async def load_facet_counts():
+    try:
+        result = await db.tools.aggregate(FACET_PIPELINE).to_list(1)
+        facet_counts.load(result[0])
+    except Exception:
+        logger.exception("Failed to load facet counts, will retry on first request")
+@app.on_event("startup")
+async def load_popularity():
+    try:
+        stats = db.tool_stats.find({}, {"_id": 0, "toolId": 1, "views": 1, "clicks": 1})
+        suggest_index.set_popularity({doc["toolId"]: popularity(doc) async for doc in stats})
+    except Exception:
+        logger.exception("Failed to load tool popularity")
+def apply_flushed_counts(flushed):
+    suggest_index.add_popularity({tool_id: popularity(counts) for tool_id, counts in flushed.items()})
+@app.on_event("startup")
+async def start_loop_lag_monitor():
+    app.state.loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
+@app.on_event("startup")
+async def start_counter_flusher():
+    app.state.counter_task = asyncio.create_task(tool_counters.run(COUNTER_FLUSH_INTERVAL, apply_flushed_counts))
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    app.state.loop_lag_task.cancel()
+    app.state.counter_task.cancel()
+    await asyncio.gather(app.state.counter_task, return_exceptions=True)
+    try:
+        await tool_counters.flush()
+    except Exception:
+        logger.exception("Failed to flush tool counters on shutdown")
     client.close()
+    password_pool.shutdown(wait=False)
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
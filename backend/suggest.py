@@ -0,0 +1,133 @@
+import heapq
+from bisect import bisect_left, insort
+
+
+MAX_SCAN = 5000
+RESULT_CACHE_SIZE = 2048
+
+
+def normalize(text):
+    return " ".join((text or "").lower().split())
+
+
+class SuggestIndex:
+    """Autocomplete over tool names and tags using a sorted array.
+
+    Entries are (term, kind, key) tuples kept sorted, so every completion of
+    a prefix is one contiguous slice found with bisect. Names are indexed from
+    the start of each word ("browser" finds "Comet Browser"); tags are indexed
+    without their leading "#".
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._tools = {}
+        self._tag_tools = {}
+        self._tag_display = {}
+        self._popularity = {}
+        self._results = {}
+
+    def __len__(self):
+        return len(self._tools)
+
+    def build(self, tools):
+        self._tools, self._tag_tools, self._tag_display, self._results = {}, {}, {}, {}
+        entries = []
+        for tool in tools:
+            entries.extend(self._register(tool))
+        entries.sort()
+        self._entries = entries
+
+    @staticmethod
+    def _name_terms(name):
+        words = normalize(name).split(" ")
+        return {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+
+    def _register(self, tool):
+        tool_id = tool["id"]
+        self._tools[tool_id] = {
+            "name": tool.get("name", ""),
+            "featured": bool(tool.get("featured")),
+            "tags": {normalize(tag).lstrip("#") for tag in tool.get("tags") or [] if tag.strip("# ")},
+        }
+        entries = [(term, "tool", tool_id) for term in self._name_terms(tool.get("name"))]
+        for tag in tool.get("tags") or []:
+            key = normalize(tag).lstrip("#")
+            if not key:
+                continue
+            members = self._tag_tools.setdefault(key, set())
+            if not members:
+                self._tag_display[key] = "#" + tag.strip().lstrip("#")
+                entries.append((key, "tag", key))
+            members.add(tool_id)
+        return entries
+
+    def add(self, tool):
+        self.remove(tool["id"])
+        for entry in self._register(tool):
+            insort(self._entries, entry)
+        self._results = {}
+
+    def _discard(self, entry):
+        i = bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+
+    def remove(self, tool_id):
+        tool = self._tools.pop(tool_id, None)
+        if tool is None:
+            return
+        for term in self._name_terms(tool["name"]):
+            self._discard((term, "tool", tool_id))
+        for key in tool["tags"]:
+            members = self._tag_tools.get(key)
+            if members is None:
+                continue
+            members.discard(tool_id)
+            if not members:
+                del self._tag_tools[key]
+                del self._tag_display[key]
+                self._discard((key, "tag", key))
+        self._results = {}
+
+    def set_popularity(self, popularity):
+        self._popularity = popularity
+        self._results = {}
+
+    def add_popularity(self, deltas):
+        for tool_id, delta in deltas.items():
+            self._popularity[tool_id] = self._popularity.get(tool_id, 0) + delta
+        self._results = {}
+
+    def _tool_score(self, tool_id):
+        tool = self._tools[tool_id]
+        return (tool["featured"], self._popularity.get(tool_id, 0), -len(tool["name"]))
+
+    def suggest(self, query, limit=8):
+        tags_only = query.strip().startswith("#")
+        prefix = normalize(query).lstrip("#")
+        if not prefix:
+            return {"tools": [], "tags": []}
+        cache_key = (prefix, tags_only, limit)
+        cached = self._results.get(cache_key)
+        if cached is not None:
+            return cached
+        tool_ids, tag_keys = set(), []
+        start = bisect_left(self._entries, (prefix,))
+        for term, kind, key in self._entries[start:start + MAX_SCAN]:
+            if not term.startswith(prefix):
+                break
+            if kind == "tag":
+                tag_keys.append(key)
+            elif not tags_only:
+                tool_ids.add(key)
+        top_tools = heapq.nlargest(limit, tool_ids, key=self._tool_score)
+        top_tags = heapq.nlargest(limit, tag_keys, key=lambda key: len(self._tag_tools[key]))
+        result = {
+            "tools": [{"id": tool_id, "name": self._tools[tool_id]["name"]} for tool_id in top_tools],
+            "tags": [{"tag": self._tag_display[key], "count": len(self._tag_tools[key])} for key in top_tags],
+        }
+        if len(self._results) >= RESULT_CACHE_SIZE:
+            self._results = {}
+        self._results[cache_key] = result
+        return result
@@ -3,6 +3,7 @@ from motor.motor_asyncio import AsyncIOMotorClient
 import os
 from dotenv import load_dotenv
 from pathlib import Path
+from datetime import datetime
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -13,18 +14,20 @@ db = client[os.environ['DB_NAME']]
 
 async def update_featured_tools():
     # Remove featured status from all tools
-    await db.tools.update_many({}, {"$set": {"featured": False}})
+    # Bump updatedAt so the API's per-tool caches pick up the change
+    now = datetime.utcnow()
+    await db.tools.update_many({"featured": True}, {"$set": {"featured": False, "updatedAt": now}})
     print("✓ Removed featured status from all tools")
     
     # Set featured=True only for Perplexity AI and Comet Browser
     result1 = await db.tools.update_one(
         {"name": "Perplexity AI"},
-        {"$set": {"featured": True}}
+        {"$set": {"featured": True, "updatedAt": now}}
     )
     
     result2 = await db.tools.update_one(
         {"name": "Comet Browser"},
-        {"$set": {"featured": True}}
+        {"$set": {"featured": True, "updatedAt": now}}
     )
     
     print(f"✅ Set featured=True for Perplexity AI (modified: {result1.modified_count})")
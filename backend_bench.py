@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+AI Tools Directory Backend Benchmark Suite
+Seeds a synthetic catalog and drives concurrent load against every API route
+
+Usage:
+  python backend_bench.py --tools 10000 --users 200                 # in-process, local mongod
+  python backend_bench.py --mongo mongomock                          # in-process, no mongod needed
+  python backend_bench.py --url http://localhost:8000                # server already running
+  python backend_bench.py --save-baseline bench_baseline.json
+  python backend_bench.py --baseline bench_baseline.json --tolerance 0.25
+
+Requires httpx (and mongomock-motor for --mongo mongomock). The server must
+share JWT_SECRET with this process so the generated tokens are accepted.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+BACKEND_DIR = ROOT_DIR / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+try:
+    import httpx
+except ImportError:
+    sys.exit("backend_bench.py needs httpx: pip install httpx")
+
+CATEGORIES = [
+    'Website Builder', 'Advertising', 'Education', 'Productivity', 'NoCode',
+    'Video Generation', 'Automation', 'AI Detection', 'Text-to-Video', 'Marketing',
+    'Writing', 'Image Generation', 'Audio', 'Code Assistant'
+]
+PRICING = ['Free', 'Freemium', 'Paid']
+WORDS = [
+    "ai", "video", "image", "writer", "code", "assistant", "marketing", "search", "voice",
+    "automation", "design", "chat", "agent", "analytics", "translate", "music", "notes",
+    "website", "ads", "presentation", "research", "detect", "summarize", "browser", "avatar"
+]
+BENCH_PASSWORD = "BenchPass123!"
+
+
+# ==================== SYNTHETIC DATA ====================
+
+def synthetic_tool(rng, index, now):
+    words = rng.sample(WORDS, 4)
+    name = f"{words[0].title()}{words[1].title()} {index}"
+    return {
+        "id": str(uuid.uuid4()),
+        "name": name,
+        "description": f"{name} helps you {words[2]} and {words[3]} with AI.",
+        "longDescription": " ".join(rng.choice(WORDS) for _ in range(80)),
+        "category": rng.choice(CATEGORIES),
+        "pricing": rng.choice(PRICING),
+        "tags": [f"#{rng.choice(WORDS).title()}{rng.choice(WORDS).title()}" for _ in range(3)],
+        "image": f"https://images.example.com/{index}.jpg",
+        "featured": rng.random() < 0.02,
+        "url": f"https://tool{index}.example.com",
+        "createdAt": now - timedelta(minutes=index),
+        "updatedAt": now - timedelta(minutes=index),
+    }
+
+
+async def insert_batched(collection, docs, batch_size=1000):
+    for start in range(0, len(docs), batch_size):
+        await collection.insert_many(docs[start:start + batch_size], ordered=False)
+
+
+async def seed(db, tools, users, favorites_per_user, submissions, seed_value):
+    from auth import get_password_hash
+
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    for name in ("tools", "users", "favorites", "submissions"):
+        await db[name].delete_many({})
+    tool_docs = [synthetic_tool(rng, i, now) for i in range(tools)]
+    await insert_batched(db.tools, tool_docs)
+    # One bcrypt hash shared by every synthetic user keeps seeding fast
+    password = get_password_hash(BENCH_PASSWORD)
+    user_docs = [{
+        "id": str(uuid.uuid4()),
+        "name": f"Bench User {i}",
+        "email": f"bench{i}@example.com",
+        "password": password,
+        "isAdmin": i == 0,
+        "createdAt": now,
+        "updatedAt": now,
+    } for i in range(users)]
+    await insert_batched(db.users, user_docs)
+    favorite_docs = []
+    for user in user_docs:
+        for tool in rng.sample(tool_docs, min(favorites_per_user, len(tool_docs))):
+            favorite_docs.append({
+                "id": str(uuid.uuid4()), "userId": user["id"], "toolId": tool["id"],
+                "createdAt": now - timedelta(seconds=rng.randint(0, 86400)),
+            })
+    await insert_batched(db.favorites, favorite_docs)
+    submission_docs = [{
+        **{k: v for k, v in synthetic_tool(rng, tools + i, now).items() if k not in ("image", "featured")},
+        "imageUrl": f"https://images.example.com/s{i}.jpg",
+        "submitterEmail": f"submitter{i}@example.com",
+        "status": "pending",
+    } for i in range(submissions)]
+    await insert_batched(db.submissions, submission_docs)
+    return tool_docs, user_docs
+
+
+# ==================== SCENARIOS ====================
+
+def build_scenarios(tool_docs, user_docs):
+    from auth import create_access_token
+
+    rng = random.Random(1)
+    tokens = [
+        create_access_token({"sub": u["email"], "userId": u["id"], "isAdmin": u["isAdmin"]})
+        for u in user_docs
+    ]
+    admin = {"Authorization": f"Bearer {tokens[0]}"}
+
+    def user_headers():
+        return {"Authorization": f"Bearer {rng.choice(tokens)}"}
+
+    def tool_id():
+        return rng.choice(tool_docs)["id"]
+
+    def user_login():
+        return {"email": rng.choice(user_docs)["email"], "password": BENCH_PASSWORD}
+
+    def submission():
+        return {
+            "name": f"Bench Submission {uuid.uuid4().hex[:8]}", "description": "d", "longDescription": "ld",
+            "category": rng.choice(CATEGORIES), "pricing": rng.choice(PRICING), "tags": "#a, #b",
+            "imageUrl": "https://images.example.com/x.jpg", "url": "https://example.com",
+            "submitterEmail": "bench@example.com",
+        }
+
+    # name -> (method, path factory, headers factory, json factory)
+    return {
+        "tools_list": ("GET", lambda: "/api/tools", None, None),
+        "tools_list_auth": ("GET", lambda: "/api/tools", user_headers, None),
+        "tools_category": ("GET", lambda: f"/api/tools?category={rng.choice(CATEGORIES)}", None, None),
+        "tools_search": ("GET", lambda: f"/api/tools?search={rng.choice(WORDS)}", None, None),
+        "tools_search_fuzzy": ("GET", lambda: f"/api/tools?search={rng.choice(WORDS)[:-1]}x&fuzzy=true", None, None),
+        "tools_search_by_name": ("GET", lambda: f"/api/tools?search={rng.choice(WORDS)}&sort=name", None, None),
+        "tools_full_view": ("GET", lambda: "/api/tools?view=full&limit=50", None, None),
+        "tool_detail": ("GET", lambda: f"/api/tools/{tool_id()}", None, None),
+        "tool_click": ("POST", lambda: f"/api/tools/{tool_id()}/click", None, None),
+        "tool_related": ("GET", lambda: f"/api/tools/{tool_id()}/related", None, None),
+        "categories": ("GET", lambda: "/api/categories", None, None),
+        "facets": ("GET", lambda: "/api/facets", None, None),
+        "suggest": ("GET", lambda: f"/api/suggest?q={rng.choice(WORDS)[:2]}", None, None),
+        "export": ("GET", lambda: "/api/tools/export", None, None),
+        "auth_me": ("GET", lambda: "/api/auth/me", user_headers, None),
+        "auth_login": ("POST", lambda: "/api/auth/login", None, user_login),
+        "favorites": ("GET", lambda: "/api/favorites", user_headers, None),
+        "favorite_add": ("POST", lambda: f"/api/favorites/{tool_id()}", user_headers, None),
+        "submissions_create": ("POST", lambda: "/api/submissions", None, submission),
+        "submissions_list": ("GET", lambda: "/api/submissions", lambda: admin, None),
+        "admin_stats": ("GET", lambda: "/api/admin/stats", lambda: admin, None),
+    }
+
+
+# ==================== LOAD DRIVER ====================
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(client, scenario, concurrency, requests_per_route, duration):
+    method, path, headers, body = scenario
+    latencies, errors, sent = [], 0, 0
+    first_error = None
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker():
+        nonlocal errors, sent, first_error
+        while True:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            if deadline is None and sent >= requests_per_route:
+                return
+            sent += 1
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    method, path(),
+                    headers=headers() if headers else None,
+                    json=body() if body else None
+                )
+                await response.aread()
+                if response.status_code >= 400:
+                    errors += 1
+                    first_error = first_error or f"HTTP {response.status_code}"
+            except Exception as e:
+                # In-process, a route's exception surfaces here; count it and
+                # keep going rather than aborting the whole run
+                errors += 1
+                first_error = first_error or f"{type(e).__name__}: {e}"
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50": round(percentile(latencies, 50), 2),
+        "p95": round(percentile(latencies, 95), 2),
+        "p99": round(percentile(latencies, 99), 2),
+        "firstError": first_error,
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result["p95"] > base["p95"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95']}ms vs baseline {base['p95']}ms")
+        if result["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['rps']} req/s vs baseline {base['rps']} req/s")
+        # Compared as rates, since --duration runs vary in request count
+        error_rate = result["errors"] / result["requests"] if result["requests"] else 0.0
+        base_rate = base["errors"] / base["requests"] if base.get("requests") else 0.0
+        if error_rate > base_rate:
+            regressions.append(f"{name}: error rate {error_rate:.2%} vs baseline {base_rate:.2%}")
+    return regressions
+
+
+# ==================== MAIN ====================
+
+async def open_database(args):
+    if args.mongo == "mongomock":
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("--mongo mongomock needs mongomock-motor: pip install mongomock-motor")
+        return AsyncMongoMockClient()[args.db_name]
+    from motor.motor_asyncio import AsyncIOMotorClient
+    return AsyncIOMotorClient(args.mongo)[args.db_name]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark every backend API route")
+    parser.add_argument("--url", help="benchmark a running server instead of booting server:app in-process")
+    parser.add_argument("--mongo", default="mongodb://localhost:27017", help="Mongo URL, or 'mongomock'")
+    parser.add_argument("--db-name", default="aibox_bench")
+    parser.add_argument("--tools", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--favorites", type=int, default=20, help="favorites per user")
+    parser.add_argument("--submissions", type=int, default=200)
+    parser.add_argument("--no-seed", action="store_true", help="reuse the data already in --db-name")
+    parser.add_argument("--routes", help="comma-separated scenario names (default: all)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500, help="requests per route")
+    parser.add_argument("--duration", type=float, help="seconds per route, overrides --requests")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save-baseline", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="fail if results regress against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression ratio")
+    args = parser.parse_args()
+
+    # server.py reads these at import time; load_dotenv does not override them
+    if args.mongo != "mongomock":
+        os.environ["MONGO_URL"] = args.mongo
+    os.environ["DB_NAME"] = args.db_name
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    # Every in-process request comes from one client IP, so the auth and
+    # submission limits would turn those scenarios into 429 measurements
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+    db = await open_database(args)
+    if args.no_seed:
+        tool_docs = await db.tools.find({}, {"_id": 0, "id": 1}).to_list(None)
+        user_docs = await db.users.find({}, {"_id": 0}).to_list(None)
+    else:
+        # Seeding wipes the target collections; never point it at a real database
+        if "bench" not in args.db_name:
+            sys.exit(f"Refusing to seed '{args.db_name}': --db-name must contain 'bench'")
+        print(f"🌱 Seeding {args.tools} tools, {args.users} users, {args.favorites} favorites/user")
+        tool_docs, user_docs = await seed(
+            db, args.tools, args.users, args.favorites, args.submissions, args.seed
+        )
+    scenarios = build_scenarios(tool_docs, user_docs)
+    if args.routes:
+        scenarios = {name: scenarios[name] for name in args.routes.split(",")}
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+    else:
+        import server
+        if args.mongo == "mongomock":
+            # Objects built at import captured collections of the real client
+            server.db = db
+            server.tool_counters.collection = db.tool_stats
+            if isinstance(server.rate_limit_backend, server.MongoRateLimitBackend):
+                server.rate_limit_backend.collection = db.rate_limits
+        for handler in server.app.router.on_startup:
+            await handler()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app), base_url="http://bench", timeout=60
+        )
+
+    results = {}
+    print(f"\n{'route':<20} {'reqs':>6} {'err':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print("-" * 72)
+    async with client:
+        for name, scenario in scenarios.items():
+            result = await run_scenario(client, scenario, args.concurrency, args.requests, args.duration)
+            results[name] = result
+            print(f"{name:<20} {result['requests']:>6} {result['errors']:>5} {result['rps']:>9} "
+                  f"{result['p50']:>9} {result['p95']:>9} {result['p99']:>9}")
+            if result["firstError"]:
+                print(f"{'':<20} first error: {result['firstError'][:120]}")
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Baseline written to {args.save_baseline}")
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        if regressions:
+            print("\n❌ REGRESSIONS:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return False
+        print("\n✅ No regressions against baseline")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+    exit(0 if success else 1)
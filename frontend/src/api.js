@@ -27,9 +27,25 @@ export const authAPI = {
   getMe: () => apiClient.get('/auth/me'),
 };
 
+// List routes return one page at a time; follow next_cursor to the last page
+const MAX_PAGE_SIZE = 1000;
+const fetchAllPages = async (path, key, params = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const response = await apiClient.get(path, {
+      params: { ...params, limit: MAX_PAGE_SIZE, ...(cursor ? { cursor } : {}) },
+    });
+    items.push(...(response.data[key] || []));
+    cursor = response.data.next_cursor;
+  } while (cursor);
+  return items;
+};
+
 // Tools APIs
 export const toolsAPI = {
   getAll: (params) => apiClient.get('/tools', { params }),
+  getAllPages: (params) => fetchAllPages('/tools', 'tools', params),
   getById: (id) => apiClient.get(`/tools/${id}`),
   create: (data) => apiClient.post('/tools', data),
   update: (id, data) => apiClient.put(`/tools/${id}`, data),
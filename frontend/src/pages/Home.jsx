@@ -26,8 +26,7 @@ const Home = () => {
   const fetchTools = async () => {
     try {
       setLoading(true);
-      const response = await toolsAPI.getAll();
-      setTools(response.data.tools || []);
+      setTools(await toolsAPI.getAllPages());
     } catch (err) {
       setError('Failed to load tools');
       console.error(err);
@@ -0,0 +1,49 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# The backend modules import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture
+def run_api():
+    """Run `scenario(client, db)` against server.app on a fresh mongomock database."""
+    pytest.importorskip("numpy")
+    httpx = pytest.importorskip("httpx")
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    # server.py reads these at import time; load_dotenv does not override them
+    os.environ["MONGO_URL"] = "mongodb://localhost:27017"
+    os.environ["DB_NAME"] = "aibox_test"
+    os.environ["RATE_LIMIT_ENABLED"] = "0"
+    import server
+
+    def run(scenario):
+        async def main():
+            # Objects built at import captured collections of the real client
+            db = mongomock_motor.AsyncMongoMockClient()["aibox_test"]
+            server.db = db
+            server.tool_counters.collection = db.tool_stats
+            # Module-level caches would otherwise serve another test's data
+            server.catalog_cache.invalidate()
+            server.favorite_ids_cache = server.FavoriteIdCache()
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await scenario(client, db)
+        asyncio.run(main())
+    return run
+
+
+@pytest.fixture
+def auth_headers():
+    """Bearer headers for a user id, signed like the login route signs them."""
+    pytest.importorskip("fastapi")
+    from auth import create_access_token
+
+    def headers(user_id, is_admin=False):
+        token = create_access_token(data={"sub": f"{user_id}@example.com", "userId": user_id, "isAdmin": is_admin})
+        return {"Authorization": f"Bearer {token}"}
+    return headers
@@ -0,0 +1,77 @@
+from facets import FacetCounts
+
+
+def loaded():
+    facets = FacetCounts()
+    facets.load({
+        "total": [{"count": 3}],
+        "category": [{"_id": "Video", "count": 2}, {"_id": "Writing", "count": 1}],
+        "pricing": [{"_id": "Free", "count": 1}, {"_id": "Paid", "count": 2}],
+        "categoryPricing": [
+            {"_id": {"category": "Video", "pricing": "Free"}, "count": 1},
+            {"_id": {"category": "Video", "pricing": "Paid"}, "count": 1},
+            {"_id": {"category": "Writing", "pricing": "Paid"}, "count": 1},
+        ],
+    })
+    return facets
+
+
+def test_load():
+    facets = loaded()
+    assert facets.ready
+    assert facets.as_dict() == {
+        "total": 3,
+        "categories": {"Video": 2, "Writing": 1},
+        "pricing": {"Free": 1, "Paid": 2},
+        "categoryPricing": [
+            {"category": "Video", "pricing": "Free", "count": 1},
+            {"category": "Video", "pricing": "Paid", "count": 1},
+            {"category": "Writing", "pricing": "Paid", "count": 1},
+        ],
+    }
+
+
+def test_load_empty_collection():
+    facets = FacetCounts()
+    facets.load({"total": [], "category": [], "pricing": [], "categoryPricing": []})
+    assert facets.as_dict() == {"total": 0, "categories": {}, "pricing": {}, "categoryPricing": []}
+
+
+def test_add_new_bucket():
+    facets = loaded()
+    facets.add({"category": "Audio", "pricing": "Free"})
+    result = facets.as_dict()
+    assert result["total"] == 4
+    assert result["categories"]["Audio"] == 1
+    assert result["pricing"]["Free"] == 2
+    assert {"category": "Audio", "pricing": "Free", "count": 1} in result["categoryPricing"]
+
+
+def test_update_moves_tool_and_drops_empty_buckets():
+    facets = loaded()
+    facets.add({"category": "Video", "pricing": "Paid"}, previous={"category": "Writing", "pricing": "Paid"})
+    result = facets.as_dict()
+    assert result["total"] == 3
+    assert result["categories"] == {"Video": 3}
+    assert result["pricing"] == {"Free": 1, "Paid": 2}
+    assert {"category": "Video", "pricing": "Paid", "count": 2} in result["categoryPricing"]
+    assert all(row["category"] != "Writing" for row in result["categoryPricing"])
+
+
+def test_remove():
+    facets = loaded()
+    facets.remove({"category": "Video", "pricing": "Free"})
+    result = facets.as_dict()
+    assert result["total"] == 2
+    assert result["categories"] == {"Video": 1, "Writing": 1}
+    assert result["pricing"] == {"Paid": 2}
+    assert len(result["categoryPricing"]) == 2
+
+
+def test_missing_fields_are_counted_under_none():
+    facets = loaded()
+    facets.add({"category": "Video"})
+    result = facets.as_dict()
+    assert result["pricing"][None] == 1
+    facets.remove({"category": "Video"})
+    assert None not in facets.as_dict()["pricing"]
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+
+def test_favorites_page_in_favoriting_order(run_api, auth_headers):
+    user = auth_headers("user-1")
+
+    async def scenario(client, db):
+        now = datetime.utcnow()
+        await db.tools.insert_many([{"id": f"t{i}", "name": f"Tool {i}", "naturalKey": f"tool {i}"} for i in range(3)])
+        await db.favorites.insert_many([
+            {"id": f"f{i}", "userId": "user-1", "toolId": tool_id, "createdAt": now + timedelta(seconds=i)}
+            for i, tool_id in enumerate(["t2", "deleted", "t0", "t1"])
+        ] + [{"id": "other", "userId": "user-2", "toolId": "t1", "createdAt": now}])
+
+        first = (await client.get("/api/favorites", params={"limit": 2}, headers=user)).json()
+        # The favorite of a deleted tool still takes a slot in the page
+        assert [tool["id"] for tool in first["favorites"]] == ["t2"]
+        assert first["favorites"][0] == {"id": "t2", "name": "Tool 2"}
+        second = (await client.get(
+            "/api/favorites", params={"limit": 2, "cursor": first["next_cursor"]}, headers=user
+        )).json()
+        assert [tool["id"] for tool in second["favorites"]] == ["t0", "t1"]
+        assert second["next_cursor"] is None
+    run_api(scenario)
+
+
+def test_add_and_remove_favorite(run_api, auth_headers):
+    user = auth_headers("user-1")
+
+    async def scenario(client, db):
+        await db.tools.insert_one({"id": "t1", "name": "Tool 1"})
+        assert (await client.post("/api/favorites/t1", headers=user)).status_code == 200
+        assert (await client.post("/api/favorites/t1", headers=user)).status_code == 200
+        assert await db.favorites.count_documents({"userId": "user-1"}) == 1
+        listed = (await client.get("/api/favorites", headers=user)).json()
+        assert [tool["id"] for tool in listed["favorites"]] == ["t1"]
+        assert (await client.delete("/api/favorites/t1", headers=user)).status_code == 200
+        assert (await client.get("/api/favorites", headers=user)).json()["favorites"] == []
+    run_api(scenario)
@@ -0,0 +1,134 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException  # noqa: E402
+
+from pagination import (  # noqa: E402
+    after_cursor, decode_cursor, encode_cursor, keyset_filter, ranked_page, split_page
+)
+
+
+def matches(doc, query):
+    """Evaluate the subset of Mongo query syntax keyset_filter produces."""
+    if "$or" in query:
+        return any(matches(doc, clause) for clause in query["$or"])
+    if "$and" in query:
+        return all(matches(doc, clause) for clause in query["$and"])
+    for field, condition in query.items():
+        if isinstance(condition, dict):
+            (op, value), = condition.items()
+            if not (doc[field] > value if op == "$gt" else doc[field] < value):
+                return False
+        elif doc[field] != condition:
+            return False
+    return True
+
+
+def test_keyset_filter_shape():
+    assert keyset_filter([("name", 1), ("id", 1)], ["Canva", "t2"]) == {"$or": [
+        {"name": {"$gt": "Canva"}},
+        {"name": "Canva", "id": {"$gt": "t2"}},
+    ]}
+    assert keyset_filter([("createdAt", -1), ("id", -1)], [5, "t2"]) == {"$or": [
+        {"createdAt": {"$lt": 5}},
+        {"createdAt": 5, "id": {"$lt": "t2"}},
+    ]}
+
+
+@pytest.mark.parametrize("sort", [
+    [("name", 1), ("id", 1)],
+    [("createdAt", -1), ("id", -1)],
+    [("category", 1), ("pricing", 1), ("name", 1), ("id", 1)],
+])
+def test_keyset_filter_selects_rows_after_cursor(sort):
+    docs = [
+        {"id": f"t{i}", "name": "ABC"[i % 3], "category": "XY"[i % 2], "pricing": "FP"[i % 4 // 2], "createdAt": i % 5}
+        for i in range(24)
+    ]
+    # Every sort here runs in one direction, so a plain tuple sort matches Mongo's
+    ordered = sorted(docs, key=lambda doc: tuple(doc[field] for field, _ in sort), reverse=sort[0][1] == -1)
+    for i, doc in enumerate(ordered):
+        query = keyset_filter(sort, [doc[field] for field, _ in sort])
+        assert [other["id"] for other in ordered if matches(other, query)] == [other["id"] for other in ordered[i + 1:]]
+
+
+def test_after_cursor_combines_with_query():
+    sort = [("name", 1), ("id", 1)]
+    cursor = encode_cursor(["Canva", "t2"])
+    assert after_cursor({}, sort, cursor) == keyset_filter(sort, ["Canva", "t2"])
+    assert after_cursor({"category": "Video"}, sort, cursor) == {
+        "$and": [{"category": "Video"}, keyset_filter(sort, ["Canva", "t2"])]
+    }
+    assert after_cursor({"category": "Video"}, sort, None) == {"category": "Video"}
+
+
+def test_cursor_accepts_scalars():
+    for values in (["Canva", "t2"], [1.5, "t2"], [True, None]):
+        assert decode_cursor(encode_cursor(values), 2) == values
+
+
+def test_cursor_round_trips_datetimes():
+    values = [datetime(2025, 1, 2, 3, 4, 5, 678000), "t1"]
+    assert decode_cursor(encode_cursor(values), 2) == values
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    encode_cursor(["only one"]),
+    encode_cursor({"a": 1}),
+    encode_cursor([{"$foo": 1}, "x"]),
+    encode_cursor([["nested"], "x"]),
+])
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 2)
+    assert error.value.status_code == 400
+
+
+def test_split_page():
+    sort = [("name", 1), ("id", 1)]
+    docs = [{"name": name, "id": f"t{i}"} for i, name in enumerate("abc")]
+    assert split_page(docs, sort, 3) == (docs, None)
+    page, cursor = split_page(docs, sort, 2)
+    assert page == docs[:2]
+    assert decode_cursor(cursor, 2) == ["b", "t1"]
+
+
+HITS = [(3.0, "b"), (2.0, "a"), (2.0, "c"), (2.0, "d"), (1.5, "a2"), (1.0, "e")]
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4, 6, 10])
+def test_ranked_page_walks_all_hits_once(limit):
+    seen, cursor = [], None
+    while True:
+        page, cursor = ranked_page(HITS, limit, cursor)
+        assert len(page) <= limit
+        seen.extend(page)
+        if cursor is None:
+            break
+    assert seen == HITS
+
+
+def test_ranked_page_resumes_after_cursor_position():
+    # The cursor hit may have dropped out of the results since; paging
+    # resumes at the first hit ranked after it
+    cursor = encode_cursor([2.0, "b"])
+    page, _ = ranked_page(HITS, 2, cursor)
+    assert page == [(2.0, "c"), (2.0, "d")]
+    page, next_cursor = ranked_page(HITS, 5, encode_cursor([1.2, "zz"]))
+    assert page == [(1.0, "e")]
+    assert next_cursor is None
+
+
+def test_ranked_page_empty():
+    assert ranked_page([], 10) == ([], None)
+
+
+@pytest.mark.parametrize("values", [["2.0", "b"], [2.0, 3], [None, "b"]])
+def test_ranked_page_invalid_cursor(values):
+    with pytest.raises(HTTPException) as error:
+        ranked_page(HITS, 2, encode_cursor(values))
+    assert error.value.status_code == 400
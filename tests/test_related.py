@@ -0,0 +1,125 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from related import RelatedIndex, term_counts  # noqa: E402
+
+
+WORDS = ["video", "image", "audio", "writing", "code", "search", "design", "music", "chat", "voice",
+         "avatar", "slides", "email", "notes", "translate", "summary"]
+
+
+def make_tool(rng, tool_id):
+    return {
+        "id": tool_id,
+        "name": " ".join(rng.sample(WORDS, 2)).title(),
+        "description": " ".join(rng.choices(WORDS, k=6)),
+        "tags": ["#" + word.title() for word in rng.sample(WORDS, 2)],
+    }
+
+
+def expected_related(index, tool_id, limit):
+    """Brute-force cosine similarities over the index's current vectors."""
+    def dense(other_id):
+        cols, vals = index._vectors[other_id]
+        vector = np.zeros(len(index._vocab))
+        vector[cols] = vals
+        return vector
+
+    query = dense(tool_id)
+    scores = [(float(query @ dense(other_id)), other_id) for other_id in index._vectors if other_id != tool_id]
+    ranked = sorted(((-score, other_id) for score, other_id in scores if score > 0))
+    return [(other_id, -score) for score, other_id in ranked[:limit]]
+
+
+def assert_matches(index, tool_id, limit):
+    actual = index.related(tool_id, limit)
+    expected = expected_related(index, tool_id, limit)
+    assert [other_id for other_id, _ in actual] == [other_id for other_id, _ in expected]
+    assert [score for _, score in actual] == pytest.approx([score for _, score in expected], rel=1e-5)
+
+
+def test_term_counts_weights_fields_and_skips_stop_words():
+    counts = term_counts({"name": "Video Maker", "description": "Make a video for the web", "tags": ["#Video"]})
+    assert counts["video"] == 3 + 1 + 2
+    assert "the" not in counts and "a" not in counts
+
+
+def test_related_ranks_similar_tools():
+    index = RelatedIndex()
+    index.build([
+        {"id": "a", "name": "Video Editor", "description": "Edit video clips", "tags": ["#Video"]},
+        {"id": "b", "name": "Video Maker", "description": "Make video clips", "tags": ["#Video"]},
+        {"id": "c", "name": "Clip Trimmer", "description": "Trim video", "tags": ["#Editing"]},
+        {"id": "d", "name": "Tax Helper", "description": "File taxes", "tags": ["#Finance"]},
+    ])
+    related = index.related("a")
+    assert [tool_id for tool_id, _ in related] == ["b", "c"]
+    assert 0 < related[1][1] < related[0][1] <= 1
+    assert index.related("d") == []
+    assert index.related("missing") is None
+
+
+def test_limit():
+    rng = random.Random(1)
+    index = RelatedIndex(pool_size=5)
+    index.build([make_tool(rng, f"t{i}") for i in range(30)])
+    for limit in (1, 3, 5):
+        assert_matches(index, "t0", limit)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cached_lists_stay_exact_through_writes(seed):
+    # A small pool forces truncated lists, so removals have to refill them
+    # and additions may only be inserted ahead of the last cached entry
+    rng = random.Random(seed)
+    index = RelatedIndex(pool_size=4)
+    tool_ids = [f"t{i}" for i in range(25)]
+    index.build([make_tool(rng, tool_id) for tool_id in tool_ids])
+    next_id = len(tool_ids)
+    for _ in range(120):
+        action = rng.random()
+        if action < 0.3 and len(tool_ids) > 2:
+            tool_id = rng.choice(tool_ids)
+            tool_ids.remove(tool_id)
+            index.remove(tool_id)
+            assert index.related(tool_id) is None
+        elif action < 0.6:
+            index.add(make_tool(rng, rng.choice(tool_ids)))
+        elif action < 0.75:
+            tool_id = f"t{next_id}"
+            next_id += 1
+            tool_ids.append(tool_id)
+            index.add(make_tool(rng, tool_id))
+        else:
+            assert_matches(index, rng.choice(tool_ids), rng.choice((1, 3, 4)))
+    for tool_id in tool_ids:
+        assert_matches(index, tool_id, 4)
+
+
+def test_remove_unknown_tool_is_a_no_op():
+    index = RelatedIndex()
+    index.build([{"id": "a", "name": "Video"}, {"id": "b", "name": "Video"}])
+    index.related("a")
+    index.remove("missing")
+    assert index.related("a") == [("b", pytest.approx(1.0))]
+
+
+def test_trimmed_list_is_recomputed_after_removals():
+    index = RelatedIndex(pool_size=2)
+    index.build([
+        {"id": "a", "name": "Video"},
+        {"id": "b", "name": "Video Clips"},
+        {"id": "c", "name": "Video Editor"},
+        {"id": "d", "name": "Taxes"},
+    ])
+    assert [tool_id for tool_id, _ in index.related("a")] == ["b", "c"]
+    # A third neighbour overflows the complete list, which now only holds
+    # the top two; after a removal it must not be served as complete
+    index.add({"id": "e", "name": "Video Maker"})
+    index.related("a")
+    index.remove("b")
+    assert_matches(index, "a", 2)
+    assert len(index.related("a", 2)) == 2
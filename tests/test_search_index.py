@@ -0,0 +1,113 @@
+import pytest
+
+from search_index import SearchIndex, tokenize
+
+
+TOOLS = [
+    {"id": "t1", "name": "Midjourney", "description": "Generate images from text prompts",
+     "tags": ["#AIArt", "#Images"], "category": "Image", "pricing": "Paid"},
+    {"id": "t2", "name": "Perplexity", "description": "Answer engine that cites its sources",
+     "tags": ["#Search"], "category": "Research", "pricing": "Freemium"},
+    {"id": "t3", "name": "Image Upscaler", "description": "Upscale any image without losing detail",
+     "tags": ["#Images"], "category": "Image", "pricing": "Free"},
+    {"id": "t4", "name": "Video Studio", "description": "Edit videos and generate images for thumbnails",
+     "tags": ["#Video"], "category": "Video", "pricing": "Paid"},
+    {"id": "t5", "name": "Copy Writer", "description": "Marketing copy in seconds",
+     "tags": ["#Writing"], "category": "Writing", "pricing": "Free", "featured": True},
+]
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.build(TOOLS)
+    return index
+
+
+def ids(hits):
+    return [tool_id for _, tool_id in hits]
+
+
+def test_tokenize_splits_camel_case_tags():
+    assert tokenize("#AIWebsiteBuilder") == ["aiwebsitebuilder", "ai", "website", "builder"]
+    assert tokenize("#AIWebsiteBuilder", split_camel=False) == ["aiwebsitebuilder"]
+
+
+def test_search_matches_prefixes_of_every_term(index):
+    assert index.search("imag") == {"t1", "t3", "t4"}
+    assert index.search("imag upscal") == {"t3"}
+    assert index.search("imag missing") == set()
+    assert index.search("  ") == set()
+
+
+def test_rank_orders_by_score_then_id(index):
+    hits = index.rank("images")
+    assert sorted(ids(hits)) == sorted(index.search("images"))
+    assert hits == sorted(hits, key=lambda hit: (-hit[0], hit[1]))
+    # A tag and description match beats a single description mention
+    assert ids(hits)[-1] == "t4"
+
+
+def test_rank_prefers_name_matches(index):
+    hits = index.rank("image")
+    assert ids(hits)[0] == "t3"
+
+
+def test_rank_filters(index):
+    assert ids(index.rank("images", category="Image")) == [i for i in ids(index.rank("images")) if i in ("t1", "t3")]
+    assert ids(index.rank("images", pricing="Free")) == ["t3"]
+    assert index.rank("images", category="Writing") == []
+
+
+def test_rank_featured_boost():
+    plain = SearchIndex(featured_boost=1.0)
+    plain.build(TOOLS)
+    boosted = SearchIndex(featured_boost=2.0)
+    boosted.build(TOOLS)
+    assert dict((tool_id, score) for score, tool_id in boosted.rank("copy"))["t5"] == pytest.approx(
+        2.0 * dict((tool_id, score) for score, tool_id in plain.rank("copy"))["t5"]
+    )
+
+
+def test_rank_cache_is_dropped_on_writes(index):
+    before = index.rank("images")
+    index.add({"id": "t6", "name": "Images Pro", "description": "Images", "tags": ["#Images"],
+               "category": "Image", "pricing": "Paid"})
+    after = index.rank("images")
+    assert "t6" in ids(after) and "t6" not in ids(before)
+    assert ids(after)[0] == "t6"
+    index.remove("t6")
+    assert ids(index.rank("images")) == ids(before)
+    assert "t6" not in index
+
+
+def test_update_replaces_old_terms(index):
+    index.add({**TOOLS[1], "name": "Answer Box"})
+    assert index.search("perplexity") == set()
+    assert index.search("answer box") == {"t2"}
+
+
+def test_remove(index):
+    index.remove("t3")
+    assert "t3" not in index
+    assert index.search("upscal") == set()
+    assert index.search("imag") == {"t1", "t4"}
+    index.remove("missing")
+    assert len(index) == 4
+
+
+def test_fuzzy_corrects_typos(index):
+    assert ids(index.rank("midjurney", fuzzy=True)) == ["t1"]
+    assert index.rank("midjourney", fuzzy=False)
+    assert index.rank("xyzzyq", fuzzy=True) == []
+
+
+def test_fuzzy_includes_exact_and_prefix_matches(index):
+    hits = index.rank("perpl", fuzzy=True)
+    assert hits == [(1.0, "t2")]
+    assert set(ids(index.rank("image", fuzzy=True))) >= {"t1", "t3", "t4"}
+
+
+def test_fuzzy_requires_every_word(index):
+    assert ids(index.rank("midjurney images", fuzzy=True)) == ["t1"]
+    assert index.rank("midjurney video", fuzzy=True) == []
@@ -0,0 +1,88 @@
+import pytest
+
+pytest.importorskip("fastapi")
+
+from models import ToolSubmission  # noqa: E402
+
+
+def submission(name):
+    return ToolSubmission(
+        name=name, description=f"{name} does things", longDescription=f"{name} does many things",
+        category="Productivity", pricing="Free", tags=["#Notes"], imageUrl="https://example.com/a.png",
+        url="https://example.com", submitterEmail="someone@example.com",
+    ).dict()
+
+
+def test_approve_creates_tool(run_api, auth_headers):
+    admin = auth_headers("admin", is_admin=True)
+
+    async def scenario(client, db):
+        pending = submission("Note Taker")
+        await db.submissions.insert_one(dict(pending))
+        response = await client.put(f"/api/submissions/{pending['id']}/approve", headers=admin)
+        assert response.status_code == 200
+        tool = response.json()["tool"]
+        assert tool["name"] == "Note Taker" and "_id" not in tool
+        assert await db.tools.count_documents({"id": tool["id"]}) == 1
+        assert (await db.submissions.find_one({"id": pending["id"]}))["status"] == "approved"
+        from server import search_index
+        assert tool["id"] in search_index
+
+        again = await client.put(f"/api/submissions/{pending['id']}/approve", headers=admin)
+        assert again.status_code == 409
+        missing = await client.put("/api/submissions/missing/approve", headers=admin)
+        assert missing.status_code == 404
+        anonymous = await client.put(f"/api/submissions/{pending['id']}/approve")
+        assert anonymous.status_code in (401, 403)
+    run_api(scenario)
+
+
+def test_batch_approves_and_rejects(run_api, auth_headers):
+    admin = auth_headers("admin", is_admin=True)
+
+    async def scenario(client, db):
+        first, second, third = submission("Alpha Notes"), submission("Beta Notes"), submission("Gamma Notes")
+        await db.submissions.insert_many([dict(first), dict(second), dict(third)])
+        response = await client.post("/api/submissions/batch", headers=admin, json={
+            "approve": [first["id"], second["id"], first["id"]],
+            "reject": [third["id"], "missing"],
+        })
+        assert response.status_code == 200
+        body = response.json()
+        approve = {result["id"]: result for result in body["results"]["approve"]}
+        reject = {result["id"]: result for result in body["results"]["reject"]}
+        assert set(approve) == {first["id"], second["id"]}
+        assert all(result["status"] == "approved" for result in approve.values())
+        assert reject[third["id"]]["status"] == "rejected"
+        assert reject["missing"] == {"id": "missing", "status": "error", "error": "Submission not found"}
+        assert body["errors"] == 1
+        assert await db.tools.count_documents({}) == 2
+        statuses = {doc["id"]: doc["status"] async for doc in db.submissions.find({})}
+        assert statuses == {first["id"]: "approved", second["id"]: "approved", third["id"]: "rejected"}
+
+        retry = (await client.post("/api/submissions/batch", headers=admin, json={
+            "approve": [first["id"]], "reject": [],
+        })).json()
+        assert retry["results"]["approve"][0]["error"] == "Submission already approved"
+        assert await db.tools.count_documents({}) == 2
+    run_api(scenario)
+
+
+def test_batch_applies_neither_action_to_conflicting_ids(run_api, auth_headers):
+    admin = auth_headers("admin", is_admin=True)
+
+    async def scenario(client, db):
+        both, other = submission("Delta Notes"), submission("Epsilon Notes")
+        await db.submissions.insert_many([dict(both), dict(other)])
+        body = (await client.post("/api/submissions/batch", headers=admin, json={
+            "approve": [both["id"], other["id"]], "reject": [both["id"]],
+        })).json()
+        assert body["results"]["approve"] == [
+            {"id": both["id"], "status": "error", "error": "Listed for both approve and reject"},
+            {"id": other["id"], "status": "approved", "toolId": body["results"]["approve"][1]["toolId"]},
+        ]
+        assert body["results"]["reject"] == []
+        assert body["errors"] == 1
+        assert (await db.submissions.find_one({"id": both["id"]}))["status"] == "pending"
+        assert await db.tools.count_documents({}) == 1
+    run_api(scenario)
@@ -0,0 +1,33 @@
+import json
+
+
+def stored_tool(tool_id, name):
+    return {
+        "id": tool_id, "name": name, "description": f"{name} helps", "longDescription": f"{name} helps a lot",
+        "category": "Productivity", "pricing": "Free", "tags": ["#Notes"], "image": "https://example.com/a.png",
+        "url": "https://example.com", "featured": False, "naturalKey": name.lower(),
+    }
+
+
+def test_public_tool_responses_omit_internal_fields(run_api, auth_headers):
+    admin = auth_headers("admin", is_admin=True)
+
+    async def scenario(client, db):
+        await db.tools.insert_many([stored_tool("t1", "Alpha"), stored_tool("t2", "Beta")])
+
+        detail = (await client.get("/api/tools/t1")).json()["tool"]
+        full = (await client.get("/api/tools", params={"view": "full"})).json()["tools"]
+        export = (await client.get("/api/tools/export")).content
+        exported = [json.loads(line) for line in export.splitlines()]
+        updated = (await client.put("/api/tools/t2", json={"pricing": "Paid"}, headers=admin)).json()["tool"]
+        unchanged = (await client.put("/api/tools/t1", json={}, headers=admin)).json()["tool"]
+
+        assert [tool["id"] for tool in full] == ["t1", "t2"]
+        assert [tool["id"] for tool in exported] == ["t1", "t2"]
+        assert updated["pricing"] == "Paid"
+        for tool in [detail, *full, *exported, updated, unchanged]:
+            assert "naturalKey" not in tool and "_id" not in tool
+            assert tool["longDescription"]
+        # Still stored for the loader
+        assert (await db.tools.find_one({"id": "t2"}))["naturalKey"] == "beta"
+    run_api(scenario)